@@ -0,0 +1,1271 @@
+"""
+Benchmarks of the parsing and analysis code on synthetic data.
+
+Run all benchmarks with
+    python benchmark.py
+or only some of them by giving their names, e.g.
+    python benchmark.py log_matcher
+
+Each benchmark times the current implementation against the implementation it
+replaced, and checks that both give the same result.
+"""
+from typing import Callable, Dict, List, Tuple
+from time import perf_counter
+import tempfile
+import tracemalloc
+import random
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+import scipy.stats as stats
+from anytree import PreOrderIter, findall as findall_nodes
+
+from src.data_interface import DataInterface
+from src.data_parser import DataParser
+from src.run_info.run_info import RunInfo
+from src.analysis.base_tools import BaseTools
+from src.analysis.confidence import ConfidenceIntervals
+from src.analysis.interval_validation import (
+    IntervalValidation,
+    default_equivalence_keys,
+)
+from src.analysis.multi_injection import MultiInjection
+from src.log_matcher import LogMatcher
+from src.analysis.structures.node import Node
+from src.analysis.structures.node_index import NodeIndex
+from src.analysis.structures.seu_log import SeuLog, SeuLogBuilder
+from src.analysis.structures.optional_data.ibexhwsec_optional_data import (
+    IbexHwsecOptionalData,
+)
+from src.analysis.structures.error_definitions import (
+    SilentError,
+    DataCorruptionError,
+    CriticalError,
+)
+from src.colorprint import ColorPrinter as cp
+
+n_log_lines = 5_000
+n_logs = 200
+n_seu_log_rows = 100_000
+n_vpi_registers = 20_000
+
+seu_metadata = {
+    "vpi_bits": "Total VPI bits: ",
+    "register": "Forcing value for env.ibex_soc_wrap.",
+    "register_delimiter": ".",
+    "injection_cycle": "Will flip bit at time: ",
+    "bit_number": "Fliping bit number: ",
+    "value_before": "Before flip: ",
+    "value_after": "After flip: ",
+    "uvm_seed": "Starting Simulation with seed: ",
+}
+comparison_data = {
+    "seed_crc": "seedcrc          :",
+    "list_crc": "[0]crclist       :",
+    "matrix_crc": "[0]crcmatrix     :",
+    "state_crc": "[0]crcstate      :",
+    "final_crc": "[0]crcfinal      :",
+}
+
+
+def synthetic_log(rng: random.Random, n_lines: int = n_log_lines) -> str:
+    """
+    Creates the text of a log shaped like the Ibex CoreMark logs: the seed and
+    injection metadata near the top, simulator chatter in the middle, and the CRC
+    lines at the end. Roughly one in ten logs is cut short before the CRC lines.
+    """
+    reg = f"ibex_soc_i.ibex_wrap.u_top.u_ibex_top.rf_reg[{rng.randint(0, 31)}]"
+    lines = [
+        f"Starting Simulation with seed: {rng.randint(0, 2**31)}\x1b[0m",
+        "Total VPI bits: 2806",
+    ]
+    lines += [f"UVM_INFO @ {i}: uvm_test_top [TEST] setup" for i in range(20)]
+    lines += [
+        f"Forcing value for env.ibex_soc_wrap.{reg}",
+        f"Will flip bit at time: {rng.randint(0, 478924)}",
+        f"Fliping bit number: {rng.randint(0, 31)}",
+        f"Before flip: {rng.randint(0, 2**32):08x}",
+        f"After flip: {rng.randint(0, 2**32):08x}",
+    ]
+    lines += [
+        f"UVM_INFO @ {i}: env.agent [MON] pc=0x{rng.randint(0, 2**32):08x} instr ok"
+        for i in range(n_lines)
+    ]
+    if rng.random() > 0.1:
+        lines += [
+            f"{pattern} 0x{rng.randint(0, 2**16):04x}"
+            for pattern in comparison_data.values()
+        ]
+
+    return "\n".join(lines) + "\n"
+
+
+def synthetic_register_paths() -> List[str]:
+    """
+    Creates register paths shaped like the Ibex register list: a register file of 32
+    registers, and a few hundred registers spread over the blocks of the core.
+    """
+    base = "ibex_soc_wrap.ibex_soc_i.ibex_wrap.u_top.u_ibex_top"
+    paths = [f"{base}.gen_regfile_ff.register_file_i.rf_reg[{i}]" for i in range(32)]
+    for block in ["if_stage_i", "id_stage_i", "ex_block_i", "load_store_unit_i"]:
+        for sub_block in range(8):
+            prefix = f"{base}.u_ibex_core.{block}.sub_{sub_block}"
+            paths += [f"{prefix}.reg_{i}_q" for i in range(25)]
+
+    return paths
+
+
+def synthetic_run_info() -> RunInfo:
+    """
+    Creates a configuration object with the SEU_METADATA and COMPARISON_DATA sections
+    used by the synthetic logs. The [DATA] section points to files which do not exist.
+    """
+    lines = ["[DATA]", "directory=data", "golden=golden.log", "seu=log.txt"]
+    lines += ["vpi=vpi_reg_list.txt", "timeout=-1", "read_optional=0"]
+    lines += ["cpu_cycles=478924", "vpi_bits=2806", "[DEBUG]"]
+    lines += ["error_utf_parsing=0", "percent_failed_reads=0"]
+    lines += ["percent_register_tree_populated=0", "loading_bar_on_data_parsing=0"]
+    lines += ["[COMPARISON_DATA]"]
+    lines += [f"{info}={pattern}" for info, pattern in comparison_data.items()]
+    lines += ["[SEU_METADATA]"]
+    lines += [f"{info}={pattern}" for info, pattern in seu_metadata.items()]
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "synthetic.ini")
+        with open(path, "w") as f:
+            f.write("\n".join(lines) + "\n")
+        run_info = RunInfo(path)
+
+    return run_info
+
+
+def synthetic_data_interface(
+    rng: np.random.Generator, n_rows: int = n_seu_log_rows
+) -> DataInterface:
+    """
+    Creates a data interface with a register tree and a SeuLog of n_rows runs on
+    random registers of the tree, without parsing any files. About 10% of the runs
+    are missing the final CRC (SEFI), and about 5% have a wrong final CRC (SDC).
+    """
+    paths = synthetic_register_paths()
+
+    data_interface = DataInterface.__new__(DataInterface)
+    data_interface.run_info = synthetic_run_info()
+    data_interface._root, data_interface._nodes = DataInterface._build_register_tree(
+        paths, "."
+    )
+    data_interface._node_index = NodeIndex(data_interface.root, data_interface.nodes)
+
+    golden = {info: f"0x{i:04x}" for i, info in enumerate(comparison_data)}
+    data_interface._golden_log = pd.Series(golden)
+
+    seu_log = {
+        "vpi_bits": np.full(n_rows, "2806", dtype=object),
+        "register": rng.choice(paths, n_rows),
+        "register_delimiter": np.full(n_rows, "ibex_soc_i", dtype=object),
+        "injection_cycle": rng.integers(0, 478924, n_rows).astype(str),
+        "bit_number": rng.integers(0, 32, n_rows).astype(str),
+        "value_before": np.char.mod("%08x", rng.integers(0, 2**32, n_rows)),
+        "value_after": np.char.mod("%08x", rng.integers(0, 2**32, n_rows)),
+        "uvm_seed": rng.integers(0, 2**31, n_rows).astype(str),
+    }
+    for info, value in golden.items():
+        seu_log[info] = np.full(n_rows, value, dtype=object)
+
+    outcome = rng.random(n_rows)
+    seu_log["final_crc"][outcome < 0.15] = "0xdead"
+    seu_log["final_crc"][outcome < 0.10] = np.nan
+
+    data_interface.seu_log = SeuLog(
+        {info: pd.Series(values, dtype=object) for info, values in seu_log.items()}
+    )
+    data_interface.seu_log.index = [f"seu_{i:07d}" for i in range(n_rows)]
+    data_interface.seu_log.name = data_interface.root.name
+
+    return data_interface
+
+
+def _time(func: Callable, *args, repeat: int = 3) -> float:
+    best = np.inf
+    for _ in range(repeat):
+        start = perf_counter()
+        func(*args)
+        best = min(best, perf_counter() - start)
+
+    return best
+
+
+def _report(name: str, before: float, after: float) -> None:
+    cp.print_bold(f"  {name}")
+    print(f"    before: {before:.4f} s")
+    print(f"    after:  {after:.4f} s")
+    print(f"    speedup: {before / after:.1f}x")
+
+
+# ======================================================================================
+# Reference implementations, copied from the code they were replaced by
+# ======================================================================================
+def _reference_log_match(lines: List[str], entries: Dict[str, str]) -> Dict[str, str]:
+    log = dict()
+    for info, match_pattern in entries.items():
+        for line in lines:
+            if match_pattern in line:
+                log[info] = line.split(match_pattern)[1].strip()
+                break
+
+    return log
+
+
+def _reference_get_seu_log_by_node(
+    data_interface: DataInterface, node: Node
+) -> pd.DataFrame:
+    return data_interface.seu_log.loc[
+        data_interface.seu_log.apply(
+            lambda x: x["register"].startswith(node.soc_path), axis=1
+        )
+    ]
+
+
+def _reference_build_register_tree(
+    register_paths: List[str], register_delimiter: str
+) -> Node:
+    root_path = register_paths[0].split(register_delimiter)[0]
+    root = Node(root_path, root_path)
+
+    for reg_path in register_paths:
+        parts = reg_path.split(register_delimiter)
+        current_node = root
+        path_to_current_node = parts[0]
+
+        for part in parts[1:]:
+            path_to_current_node += f".{part}"
+            current_node_children_names = [
+                child.name for child in current_node.children
+            ]
+            if part not in current_node_children_names:
+                current_node = Node(
+                    name=part, parent=current_node, soc_path=path_to_current_node
+                )
+            else:
+                current_node = [
+                    child for child in current_node.children if child.name == part
+                ][0]
+
+    return root
+
+
+def _reference_get_node_by_path(root: Node, path: str) -> Node:
+    nodes = findall_nodes(root, filter_=lambda node: node.soc_path.startswith(path))
+
+    if len(nodes) == 0:
+        return None
+
+    if len(nodes) == 1:
+        return nodes[0]
+
+    node_depths = [node.depth for node in nodes]
+
+    return nodes[node_depths.index(min(node_depths))]
+
+
+def _reference_get_node_by_name(root: Node, name: str) -> tuple:
+    return findall_nodes(root, filter_=lambda node: node.name == name)
+
+
+def _reference_windowed_error_rate(
+    data_interface: DataInterface,
+    node: Node,
+    injection_time_col: str,
+    window_size: int = 150,
+    confidence: float = 0.95,
+) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    seu_log = data_interface.get_seu_log_by_node(node)
+    error_classifications = BaseTools.error_classification(
+        data_interface, node, visualize=False
+    )
+
+    n = len(error_classifications)
+    z = stats.norm.ppf(1 - (1 - confidence) / 2)
+    errors = [SilentError.name, DataCorruptionError.name, CriticalError.name]
+
+    df = pd.DataFrame(
+        columns=errors,
+        data=np.zeros((n, len(errors))),
+        index=seu_log[injection_time_col].astype(float),
+    ).sort_index()
+
+    conf_lower = df.copy()
+    conf_upper = df.copy()
+
+    error_classifications = error_classifications.to_frame()
+    error_classifications[injection_time_col] = seu_log.copy()[
+        injection_time_col
+    ].astype(float)
+    error_classifications.sort_values(injection_time_col, inplace=True)
+    error_classifications.drop(columns=[injection_time_col], inplace=True)
+    error_classifications = error_classifications.squeeze()
+
+    def confidence_and_error_rate(error_class: pd.Series) -> Tuple[pd.Series, float]:
+        _dummies = pd.get_dummies(error_class)
+        for _e in errors:
+            if _e not in _dummies.columns:
+                _dummies[_e] = np.zeros(len(_dummies)).astype(bool)
+
+        _std = _dummies.std()
+        _ci = z * _std / np.sqrt(len(_dummies))
+        _dfr = _dummies.sum() / len(_dummies)
+
+        # the original returned these in the column order of _dummies, which .iloc
+        # assigned by position, mixing up the classes in windows missing a class
+        return _dfr[errors], _ci[errors]
+
+    ws_2 = window_size // 2
+    for i in range(ws_2, n - ws_2):
+        rates, ci = confidence_and_error_rate(
+            error_class=error_classifications[i - ws_2 : i + ws_2]
+        )
+        df.iloc[i] = rates
+        conf_lower.iloc[i] = rates - ci
+        conf_upper.iloc[i] = rates + ci
+
+    return df, conf_lower, conf_upper
+
+
+def _reference_error_classification(
+    data_interface: DataInterface, node: Node
+) -> pd.Series:
+    seu_log = data_interface.get_seu_log_by_node(node)
+    golden_log = data_interface.golden_log
+
+    compare_cols = seu_log.columns.intersection(golden_log.index)
+    crit_cols = data_interface.run_info.comparison_data.entries
+    crit_cols = crit_cols + data_interface.run_info.seu_metadata.entries
+
+    is_critical = seu_log[crit_cols].isna().any(axis=1)
+    is_corruption = seu_log[compare_cols].ne(golden_log).any(axis=1) & ~is_critical
+    is_silent = ~(is_critical | is_corruption)
+
+    error_class = pd.Series([None] * len(seu_log), index=seu_log.index)
+    error_class[is_critical] = CriticalError.name
+    error_class[is_corruption] = DataCorruptionError.name
+    error_class[is_silent] = SilentError.name
+
+    return error_class
+
+
+# ======================================================================================
+# Benchmarks
+# ======================================================================================
+def benchmark_log_matcher() -> None:
+    rng = random.Random(0)
+    texts = [synthetic_log(rng) for _ in range(n_logs)]
+    entries = {**seu_metadata, **comparison_data}
+    matcher = LogMatcher(entries)
+
+    def before():
+        return [_reference_log_match(text.splitlines(True), entries) for text in texts]
+
+    def after():
+        return [matcher.match(text) for text in texts]
+
+    assert before() == after(), "LogMatcher does not match the reference parser"
+
+    cp.print_header(f"Log matcher, {n_logs} logs of {n_log_lines} lines")
+    _report("match all entries", _time(before), _time(after))
+
+
+def benchmark_byte_scanning() -> None:
+    rng = random.Random(0)
+    run_info = synthetic_run_info()
+    matcher = LogMatcher.from_seu_metadata(
+        run_info, list({**seu_metadata, **comparison_data})
+    )
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        paths = list()
+        for i in range(n_logs):
+            data = synthetic_log(rng).encode()
+            # one in twenty logs has a byte which is not UTF-8 in the chatter
+            if i % 20 == 0:
+                pos = data.index(b"instr ok", len(data) // 2)
+                data = data[:pos] + b"\xcc\xff" + data[pos:]
+
+            paths.append(os.path.join(data_dir, f"seu_{i:05d}.txt"))
+            with open(paths[-1], "wb") as f:
+                f.write(data)
+
+        def before():
+            # decodes the whole log, and fails the run on any invalid byte
+            logs = list()
+            for path in paths:
+                try:
+                    with open(path, "r", encoding="utf-8") as f:
+                        logs.append(matcher.match(f.read()))
+                except UnicodeDecodeError:
+                    logs.append(None)
+            return logs
+
+        def after():
+            return [
+                DataParser._read_single_seu_log(run_info, path, matcher)[0]
+                for path in paths
+            ]
+
+        expected, result = before(), after()
+        for expected_log, log in zip(expected, result):
+            found = {info: value for info, value in log.items() if value is not np.nan}
+            assert expected_log is None or expected_log == found
+        n_recovered = sum(log is None for log in expected)
+
+        cp.print_header(f"Byte scanning, {n_logs} logs of {n_log_lines} lines")
+        print(f"  failed reads before: {n_recovered}, after: 0")
+        _report("read and match all logs", _time(before), _time(after))
+
+
+def benchmark_head_tail_reading() -> None:
+    rng = random.Random(0)
+    run_info = synthetic_run_info()
+    matcher = LogMatcher.from_seu_metadata(
+        run_info, list({**seu_metadata, **comparison_data})
+    )
+    partial_run_info = synthetic_run_info()
+    partial_run_info.data.read_head_kb = 4
+    partial_run_info.data.read_tail_kb = 1
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        paths = list()
+        for i in range(n_logs):
+            paths.append(os.path.join(data_dir, f"seu_{i:05d}.txt"))
+            with open(paths[-1], "w") as f:
+                f.write(synthetic_log(rng))
+        n_bytes = sum(os.path.getsize(path) for path in paths)
+
+        def before():
+            return [
+                DataParser._read_single_seu_log(run_info, path, matcher)[0]
+                for path in paths
+            ]
+
+        def after():
+            return [
+                DataParser._read_single_seu_log(partial_run_info, path, matcher)[0]
+                for path in paths
+            ]
+
+        assert before() == after()
+
+        cp.print_header(
+            f"Head and tail reading, {n_logs} logs of {n_bytes / n_logs / 1024:.0f} KB"
+        )
+        _report("read and match all logs", _time(before), _time(after))
+
+
+def benchmark_node_index() -> None:
+    data_interface = synthetic_data_interface(np.random.default_rng(0))
+    nodes = list(PreOrderIter(data_interface.root))
+    rf_node = [node for node in nodes if node.name == "register_file_i"][0]
+    leaf = [node for node in nodes if node.is_leaf][0]
+
+    # the node itself and the paths under it, fast enough to check every node
+    registers = data_interface.seu_log["register"].astype(str)
+    for node in nodes:
+        expected = data_interface.seu_log.loc[
+            (registers == node.soc_path) | registers.str.startswith(node.soc_path + ".")
+        ]
+        result = data_interface.get_seu_log_by_node(node)
+        assert expected.index.equals(result.index), f"Rows differ: {node.soc_path}"
+
+    cp.print_header(f"get_seu_log_by_node, SeuLog of {n_seu_log_rows} rows")
+    for name, node in [("root", data_interface.root), ("register file", rf_node)]:
+        _report(
+            name,
+            _time(_reference_get_seu_log_by_node, data_interface, node),
+            _time(data_interface.get_seu_log_by_node, node),
+        )
+
+    _report(
+        "leaf",
+        _time(_reference_get_seu_log_by_node, data_interface, leaf),
+        _time(data_interface.get_seu_log_by_node, leaf, repeat=100),
+    )
+
+    data_interface._invalidate_caches()
+    start = perf_counter()
+    data_interface._register_index = data_interface._build_register_index()
+    print(f"  building the index: {perf_counter() - start:.4f} s")
+
+
+def benchmark_register_tree() -> None:
+    # a few wide register arrays, like the memories and register files of an SoC
+    base = "ibex_soc_wrap.ibex_soc_i"
+    paths = synthetic_register_paths()
+    n_arrays = 10
+    for array in range(n_arrays):
+        paths += [
+            f"{base}.u_ram_{array}.mem[{i}]" for i in range(n_vpi_registers // n_arrays)
+        ]
+
+    def tree_summary(root: Node) -> List[tuple]:
+        return [(node.soc_path, node.name, node.depth) for node in PreOrderIter(root)]
+
+    expected = tree_summary(_reference_build_register_tree(paths, "."))
+    root, nodes = DataInterface._build_register_tree(paths, ".")
+    assert tree_summary(root) == expected, "Register trees differ"
+    assert all(nodes[node.soc_path] is node for node in PreOrderIter(root))
+
+    cp.print_header(f"Register tree, {len(paths)} registers")
+    _report(
+        "build tree",
+        _time(_reference_build_register_tree, paths, ".", repeat=1),
+        _time(DataInterface._build_register_tree, paths, ".", repeat=1),
+    )
+
+
+def benchmark_node_lookup() -> None:
+    data_interface = synthetic_data_interface(np.random.default_rng(0), n_rows=10)
+    root = data_interface.root
+    nodes = list(PreOrderIter(root))
+    # every register path, and a partial path for each, e.g. "...rf_reg[1"
+    paths = [node.soc_path for node in nodes if node.is_leaf]
+    paths += [path[:-1] for path in paths]
+    names = [node.name for node in nodes]
+
+    for path in paths:
+        expected = _reference_get_node_by_path(root, path)
+        assert data_interface.get_node_by_path(path) is expected, f"Differs: {path}"
+    for name in set(names):
+        expected = _reference_get_node_by_name(root, name)
+        assert data_interface.get_node_by_name(name) == expected, f"Differs: {name}"
+
+    cp.print_header(f"Node lookup, tree of {len(nodes)} nodes")
+    _report(
+        f"{len(paths)} paths",
+        _time(lambda: [_reference_get_node_by_path(root, path) for path in paths]),
+        _time(data_interface.get_nodes_by_paths, paths),
+    )
+    _report(
+        f"{len(names)} names",
+        _time(lambda: [_reference_get_node_by_name(root, name) for name in names]),
+        _time(data_interface.get_nodes_by_names, names),
+    )
+
+    start = perf_counter()
+    NodeIndex(root)
+    print(f"  building the index: {perf_counter() - start:.4f} s")
+
+
+def benchmark_windowed_error_rate() -> None:
+    data_interface = synthetic_data_interface(np.random.default_rng(0))
+    node = data_interface.get_node_by_name("register_file_i")[0]
+    n_runs = len(data_interface.get_seu_log_by_node(node))
+
+    for window_size in [2, 20, 150]:
+        expected = _reference_windowed_error_rate(
+            data_interface, node, "injection_cycle", window_size
+        )
+        result = BaseTools.windowed_error_rate(
+            data_interface, node, "injection_cycle", window_size
+        )
+        for _expected, _result in zip(expected, result):
+            pd.testing.assert_frame_equal(_expected, _result, check_exact=False)
+
+    cp.print_header(f"windowed_error_rate, {n_runs} runs")
+    _report(
+        "window size 150",
+        _time(
+            _reference_windowed_error_rate,
+            data_interface,
+            node,
+            "injection_cycle",
+            repeat=1,
+        ),
+        _time(BaseTools.windowed_error_rate, data_interface, node, "injection_cycle"),
+    )
+
+
+def benchmark_error_classification() -> None:
+    data_interface = synthetic_data_interface(np.random.default_rng(0))
+    nodes = [node for node in PreOrderIter(data_interface.root) if node.depth <= 7]
+
+    for node in nodes:
+        expected = _reference_error_classification(data_interface, node)
+        result = BaseTools.error_classification(data_interface, node)
+        assert expected.equals(result.astype(object)), f"Differs: {node.soc_path}"
+
+    def before():
+        return [_reference_error_classification(data_interface, node) for node in nodes]
+
+    def after():
+        data_interface._invalidate_caches()
+        return [BaseTools.error_classification(data_interface, node) for node in nodes]
+
+    cp.print_header(f"error_classification, SeuLog of {n_seu_log_rows} rows")
+    _report(f"{len(nodes)} nodes, cold cache", _time(before, repeat=1), _time(after))
+
+
+def benchmark_error_rate_tree() -> None:
+    data_interface = synthetic_data_interface(np.random.default_rng(0))
+    nodes = list(PreOrderIter(data_interface.root))
+    errors = [SilentError.name, DataCorruptionError.name, CriticalError.name]
+
+    def before():
+        counts = dict()
+        for node in nodes:
+            error_class = _reference_error_classification(data_interface, node)
+            counts[node.soc_path] = error_class.value_counts()
+        return pd.DataFrame(counts).T.reindex(columns=errors).fillna(0)
+
+    def after():
+        data_interface._invalidate_caches()
+        return BaseTools.error_rate_tree(data_interface)
+
+    expected = before()
+    result = after()
+    assert (result["count"].loc[expected.index] == expected).all(axis=None)
+    assert (result["n"] == result["count"].sum(axis=1)).all()
+
+    cp.print_header(f"error_rate_tree, SeuLog of {n_seu_log_rows} rows")
+    before_time = _time(before, repeat=1)
+    _report(f"all {len(nodes)} nodes, cold cache", before_time, _time(after))
+    _report(
+        f"all {len(nodes)} nodes, warm cache",
+        before_time,
+        _time(BaseTools.error_rate_tree, data_interface),
+    )
+
+
+def benchmark_seu_log_schema() -> None:
+    data_interface = synthetic_data_interface(np.random.default_rng(0))
+    parsed = pd.DataFrame(data_interface.seu_log)
+    # the simulator leaves a colour reset after the seed
+    parsed["uvm_seed"] = parsed["uvm_seed"] + "\x1b[0m"
+    run_info = data_interface.run_info
+
+    typed = SeuLog.from_parsed(parsed, run_info)
+    for column in parsed.columns:
+        expected = parsed[column].str.split("\x1b").str[0]
+        result = typed[column].astype(object).map(str)
+        if column in SeuLog.float_columns:
+            expected = pd.to_numeric(expected)
+            result = typed[column].astype(float)
+        assert (expected.isna() == typed[column].isna()).all(), column
+        assert (expected[expected.notna()] == result[expected.notna()]).all(), column
+
+    data_interface.seu_log = typed
+    data_interface.seu_log.name = data_interface.root.name
+    data_interface._invalidate_caches()
+    typed_classes = data_interface.error_classes.copy()
+    data_interface.seu_log = SeuLog(parsed)
+    data_interface._invalidate_caches()
+    assert typed_classes.equals(data_interface.error_classes)
+
+    cp.print_header(f"SeuLog schema, SeuLog of {n_seu_log_rows} rows")
+    before = parsed.memory_usage(deep=True).sum() / 2**20
+    after = typed.memory_usage(deep=True).sum() / 2**20
+    cp.print_bold("  memory")
+    print(f"    before: {before:.1f} MB")
+    print(f"    after:  {after:.1f} MB")
+    print(f"    reduction: {before / after:.1f}x")
+    print(f"  converting: {_time(SeuLog.from_parsed, parsed, run_info):.4f} s")
+
+    def classify(seu_log: SeuLog):
+        data_interface.seu_log = seu_log
+        data_interface._invalidate_caches()
+        return data_interface.error_classes
+
+    _report(
+        "error classes",
+        _time(classify, SeuLog(parsed)),
+        _time(classify, typed),
+    )
+
+
+def benchmark_seu_log_builder() -> None:
+    data_interface = synthetic_data_interface(np.random.default_rng(0))
+    run_info = data_interface.run_info
+    parsed = pd.DataFrame(data_interface.seu_log)
+    columns = list(parsed.columns)
+    rows = parsed.to_numpy()
+    runs = list(parsed.index)
+    del data_interface
+
+    def parsed_logs():
+        # fresh strings for every run, as the parser creates them
+        for run, row in zip(runs, rows):
+            yield run, {
+                column: value if not isinstance(value, str) else "".join(value)
+                for column, value in zip(columns, row)
+            }
+
+    def before():
+        run_logs = dict()
+        for run, log in parsed_logs():
+            run_logs[run] = log
+        return SeuLog.from_parsed(pd.DataFrame(run_logs).T, run_info)
+
+    def after():
+        builder = SeuLogBuilder(run_info, columns)
+        for run, log in parsed_logs():
+            builder.append(run, log)
+        return builder.build()
+
+    def peak_memory(func: Callable) -> float:
+        tracemalloc.start()
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return peak / 2**20
+
+    pd.testing.assert_frame_equal(pd.DataFrame(before()), pd.DataFrame(after()))
+
+    cp.print_header(f"SeuLogBuilder, {n_seu_log_rows} parsed runs")
+    final = after().memory_usage(deep=True).sum() / 2**20
+    cp.print_bold("  peak memory")
+    print(f"    before: {peak_memory(before):.1f} MB")
+    print(f"    after:  {peak_memory(after):.1f} MB")
+    print(f"    final SeuLog: {final:.1f} MB")
+    _report("time", _time(before, repeat=1), _time(after, repeat=1))
+
+
+def benchmark_coverage() -> None:
+    data_interface = synthetic_data_interface(np.random.default_rng(0))
+    # leave a part of the tree without runs
+    registers = data_interface.seu_log["register"]
+    data_interface.seu_log = data_interface.seu_log[~registers.str.contains("csr")]
+    nodes = list(PreOrderIter(data_interface.root))
+
+    def before():
+        # the unpopulated percentage as DataInterface.__init__ used to compute it
+        all_nodes = list(findall_nodes(data_interface.root))
+        all_nodes = [node for node in all_nodes if node.is_leaf]
+
+        unpopulated_nodes = all_nodes.copy()
+        hit_regs = list(data_interface.seu_log.register.unique())
+
+        for node in all_nodes:
+            if node.soc_path in hit_regs:
+                unpopulated_nodes.remove(node)
+
+        return len(unpopulated_nodes) * 100 / len(all_nodes)
+
+    def after():
+        data_interface._invalidate_caches()
+        return data_interface.unpopulated_percent
+
+    assert np.isclose(before(), after())
+    coverage = data_interface.coverage
+    for node in nodes:
+        runs = data_interface.get_rows_by_node(node)
+        assert coverage["n_runs"][node.soc_path] == len(runs), node.soc_path
+        leaves = [leaf for leaf in node.leaves if leaf.soc_path in coverage.index]
+        n_covered = sum(coverage["n_runs"][leaf.soc_path] > 0 for leaf in leaves)
+        assert coverage["n_covered_leaves"][node.soc_path] == n_covered
+
+    cp.print_header(f"coverage, SeuLog of {n_seu_log_rows} rows")
+    _report(
+        f"unpopulated percentage, {len(nodes)} nodes",
+        _time(before, repeat=1),
+        _time(after),
+    )
+
+
+def synthetic_inject_intervals(
+    rng: np.random.Generator, n_cycles: int, n_registers: int = 32
+) -> pd.DataFrame:
+    """
+    Creates a table of injection intervals: for every register, the cycles are split
+    into intervals of 1 to 200 cycles, and about half of the intervals are sensitive,
+    with an encoded cycle unique to the interval.
+    """
+    columns = dict()
+    for register in range(n_registers):
+        lengths = rng.integers(1, 200, n_cycles)
+        starts = np.cumsum(lengths)
+        interval = np.searchsorted(starts, np.arange(n_cycles), side="right")
+        sensitive = rng.random(len(lengths)) < 0.5
+        columns[f"x{register}"] = np.where(sensitive[interval], interval + 1, 0)
+
+    return pd.DataFrame(columns, index=pd.RangeIndex(n_cycles, name="Cycle"))
+
+
+def _reference_interval_validation(
+    data_interface: DataInterface, node: Node, inject_intervals: pd.DataFrame
+) -> Tuple[pd.DataFrame, List[int], int]:
+    # the validation as test.py used to do it
+    node_seu_logs = data_interface.get_seu_log_by_node(node)
+    error_classification = BaseTools.error_classification(data_interface, node)
+
+    checking_df = dict()
+    for run_name, row in node_seu_logs.iterrows():
+        register = "x" + str(31 - int(row["register"].split("[")[1].strip("]")))
+        injection_cycle = int(float(row["injection_cycle"]))
+        error_class = error_classification.loc[run_name]
+        try:
+            encoded_cycle = inject_intervals[register][injection_cycle]
+        except KeyError:
+            continue
+        checking_df[run_name] = {
+            "register": register,
+            "injection_cycle": injection_cycle,
+            "bit_number": int(row["bit_number"]),
+            "seed": int(row["uvm_seed"]),
+            "error_class": error_class,
+            "is_silent": error_class == SilentError.name,
+            "is_sensitive": encoded_cycle != 0,
+            "encoded_cycle": encoded_cycle,
+        }
+    checking_df = pd.DataFrame(checking_df).T
+
+    quadrants = [
+        checking_df.apply(
+            lambda row: row["is_silent"] == silent and row["is_sensitive"] == sensitive,
+            axis=1,
+        ).sum()
+        for sensitive in [True, False]
+        for silent in [True, False]
+    ]
+
+    equivalent = checking_df[checking_df["encoded_cycle"] != 0].copy()
+    equivalent["unique"] = equivalent.apply(
+        lambda row: "Register: "
+        + str(row["register"])
+        + "\nEncoded cycle: "
+        + str(row["encoded_cycle"])
+        + "\nBit number: "
+        + str(row["bit_number"]),
+        axis=1,
+    )
+    n_inconsistent = 0
+    for _, unique in equivalent.groupby("unique"):
+        if unique["error_class"].nunique() != 1:
+            n_inconsistent += 1
+
+    return checking_df, quadrants, n_inconsistent
+
+
+def benchmark_interval_validation() -> None:
+    rng = np.random.default_rng(0)
+    n_cycles = 20_000
+    data_interface = synthetic_data_interface(rng)
+    # every run on the register file, at a cycle in the table, with few distinct
+    # bits so some equivalence classes hold more than one run
+    n_rows = len(data_interface.seu_log)
+    register_file = [path for path in data_interface.nodes if "rf_reg[" in path]
+    data_interface.seu_log["register"] = rng.choice(register_file, n_rows)
+    data_interface.seu_log["injection_cycle"] = rng.integers(0, n_cycles + 100, n_rows)
+    data_interface.seu_log["bit_number"] = rng.integers(0, 2, n_rows)
+    data_interface._invalidate_caches()
+    node = data_interface.get_node_by_name("register_file_i")[0]
+    inject_intervals = synthetic_inject_intervals(rng, n_cycles)
+
+    def before():
+        return _reference_interval_validation(data_interface, node, inject_intervals)
+
+    def after():
+        table, missing = IntervalValidation.injection_table(
+            data_interface, node, inject_intervals
+        )
+        confusion = IntervalValidation.confusion_matrix(table)
+        classes = IntervalValidation.equivalence_classes(table)
+        inconsistent = IntervalValidation.inconsistent_injections(table)
+        return table, missing, confusion, classes, inconsistent
+
+    checking_df, quadrants, n_inconsistent = before()
+    table, missing, confusion, classes, inconsistent = after()
+    for column in checking_df.columns:
+        expected = checking_df[column].astype(str)
+        assert (table[column].astype(str) == expected.loc[table.index]).all(), column
+    assert len(table) == len(checking_df)
+    assert len(table) + len(missing) == n_rows
+    assert list(confusion.to_numpy().ravel()) == quadrants
+    assert (~classes["consistent"]).sum() == n_inconsistent
+    assert inconsistent["equivalence_class"].nunique() == n_inconsistent
+
+    cp.print_header(f"Interval validation, {n_rows} runs on the register file")
+    _report("validate all runs", _time(before, repeat=1), _time(after))
+
+
+def benchmark_deduplication() -> None:
+    rng = np.random.default_rng(0)
+    n_cycles = 2_000
+    data_interface = synthetic_data_interface(rng)
+    n_rows = len(data_interface.seu_log)
+    register_file = [path for path in data_interface.nodes if "rf_reg[" in path]
+    on_register_file = rng.random(n_rows) < 0.8
+    registers = data_interface.seu_log["register"].to_numpy()
+    registers[on_register_file] = rng.choice(register_file, on_register_file.sum())
+    data_interface.seu_log["register"] = registers
+    data_interface.seu_log["injection_cycle"] = rng.integers(0, n_cycles, n_rows)
+    data_interface.seu_log["bit_number"] = rng.integers(0, 32, n_rows)
+    inject_intervals = synthetic_inject_intervals(rng, n_cycles)
+
+    # make the error class a function of the equivalence class, except for a few runs
+    data_interface._invalidate_caches()
+    node = data_interface.get_node_by_name("register_file_i")[0]
+    table, _ = IntervalValidation.injection_table(
+        data_interface, node, inject_intervals
+    )
+    class_ids = table.groupby(list(default_equivalence_keys), observed=True).ngroup()
+    final_crc = data_interface.seu_log["final_crc"].copy()
+    golden_crc = data_interface.golden_log["final_crc"]
+    outcome = (class_ids.to_numpy() * 7919) % 20
+    outcome[rng.random(len(outcome)) < 0.01] = 0
+    final_crc[table.index] = np.where(
+        outcome == 0, np.nan, np.where(outcome == 1, "0xdead", golden_crc)
+    )
+    data_interface.seu_log["final_crc"] = final_crc
+    data_interface._invalidate_caches()
+    table, _ = IntervalValidation.injection_table(
+        data_interface, node, inject_intervals
+    )
+
+    deduplicated = IntervalValidation.deduplicate(data_interface, table)
+    full_tree = BaseTools.error_rate_tree(data_interface)
+    deduplicated_tree = BaseTools.error_rate_tree(deduplicated)
+    assert np.allclose(
+        full_tree["rate"].to_numpy(),
+        deduplicated_tree["rate"].to_numpy(),
+        equal_nan=True,
+    )
+    # the collapsed runs count as the runs they stand for, so the intervals match
+    for stat in ["n_eff", "ci_lower", "ci_upper"]:
+        assert np.allclose(
+            full_tree[stat].to_numpy(),
+            deduplicated_tree[stat].to_numpy(),
+            equal_nan=True,
+        )
+    for stat in ["n", "count"]:
+        assert (full_tree[stat] == deduplicated_tree[stat]).all(axis=None), stat
+    full_remaining = BaseTools.remaining_runs(data_interface, 0.05)
+    deduplicated_remaining = BaseTools.remaining_runs(deduplicated, 0.05)
+    assert (
+        full_remaining["remaining_runs"] == deduplicated_remaining["remaining_runs"]
+    ).all()
+
+    def error_rate_tree(data_interface: DataInterface):
+        data_interface._invalidate_caches()
+        return BaseTools.error_rate_tree(data_interface)
+
+    cp.print_header(f"Deduplication, SeuLog of {n_seu_log_rows} rows")
+    report = IntervalValidation.redundancy_report(table)
+    for name, value in report.items():
+        value = f"{value:.3f}" if isinstance(value, float) else value
+        print(f"  {name}: {value}")
+    print(f"  rows after deduplication: {len(deduplicated.seu_log)}")
+    _report(
+        "error_rate_tree, cold cache",
+        _time(error_rate_tree, data_interface),
+        _time(error_rate_tree, deduplicated),
+    )
+
+
+def benchmark_optional_alerts() -> None:
+    rng = np.random.default_rng(0)
+    runs = [f"seu_{i:07d}" for i in range(n_seu_log_rows)]
+    # about 20% of the runs raise between 1 and 4 alerts
+    n_alerts = np.where(rng.random(len(runs)) < 0.2, rng.integers(1, 5, len(runs)), 0)
+    records = {
+        run: [
+            (int(value), int(cycle))
+            for value, cycle in zip(rng.integers(1, 16, n), rng.integers(0, 478924, n))
+        ]
+        for run, n in zip(runs, n_alerts)
+    }
+    optional_data = IbexHwsecOptionalData(synthetic_run_info())
+    name_val, name_cyc = optional_data.alert_val_name, optional_data.alert_cyc_name
+
+    def before():
+        # one DataFrame per run with alerts, as the class used to store them
+        optional_datas = dict()
+        for run, run_records in records.items():
+            if len(run_records) > 0:
+                optional_datas[run] = pd.DataFrame(
+                    [{name_val: val, name_cyc: cyc} for val, cyc in run_records]
+                )
+        return optional_datas
+
+    def before_summary(optional_datas: Dict[str, pd.DataFrame]):
+        rows = dict()
+        for run in runs:
+            alerts = optional_datas.get(run)
+            if alerts is None:
+                rows[run] = (False, pd.NA, 0)
+            else:
+                rows[run] = (True, alerts[name_cyc].min(), len(alerts))
+        return rows
+
+    def after():
+        optional_data = IbexHwsecOptionalData(synthetic_run_info())
+        for run, run_records in records.items():
+            optional_data.add_records(run, run_records)
+        optional_data.alerts
+        return optional_data
+
+    def after_summary(optional_data: IbexHwsecOptionalData):
+        return optional_data.get_alert_summary(runs)
+
+    optional_datas = before()
+    optional_data = after()
+    expected = before_summary(optional_datas)
+    summary = after_summary(optional_data)
+    for run, row in zip(runs, summary.itertuples(index=False)):
+        assert row[0] == expected[run][0] and row[2] == expected[run][2], run
+        assert row[0] == False or row[1] == expected[run][1], run
+    for run in runs[:100]:
+        if run in optional_datas:
+            pd.testing.assert_frame_equal(
+                optional_datas[run], optional_data.get_data_by_run(run)
+            )
+
+    cp.print_header(f"IbexHwsecOptionalData, {n_seu_log_rows} runs")
+    del optional_datas, optional_data
+
+    def retained_memory(func: Callable) -> float:
+        # memory_usage() misses the fixed overhead of each DataFrame
+        tracemalloc.start()
+        result = func()
+        retained = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del result
+        return retained / 2**20
+
+    cp.print_bold("  memory")
+    print(f"    before: {retained_memory(before):.1f} MB")
+    print(f"    after:  {retained_memory(after):.1f} MB")
+    _report("storing alerts", _time(before, repeat=1), _time(after, repeat=1))
+    _report(
+        "per-run summary",
+        _time(before_summary, before(), repeat=1),
+        _time(after_summary, after()),
+    )
+
+
+def _reference_confidence_intervals(
+    counts: np.ndarray, n: np.ndarray, confidence: float, method: str
+) -> Tuple[np.ndarray, np.ndarray]:
+    # one scipy call per node and error class
+    lower = np.full(counts.shape, np.nan)
+    upper = np.full(counts.shape, np.nan)
+    for i, j in np.ndindex(counts.shape):
+        if n[i] > 0:
+            ci = stats.binomtest(int(counts[i, j]), int(n[i])).proportion_ci(
+                confidence, method
+            )
+            lower[i, j], upper[i, j] = ci.low, ci.high
+
+    return lower, upper
+
+
+def _reference_bootstrap(
+    counts: np.ndarray, n: np.ndarray, confidence: float, n_bootstrap: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    # one multinomial draw per node
+    rng = np.random.default_rng(0)
+    alpha = 1 - confidence
+    lower = np.full(counts.shape, np.nan)
+    upper = np.full(counts.shape, np.nan)
+    for i in range(len(counts)):
+        if n[i] > 0:
+            draws = rng.multinomial(n[i], counts[i] / n[i], size=n_bootstrap)
+            lower[i], upper[i] = np.quantile(
+                draws / n[i], [alpha / 2, 1 - alpha / 2], axis=0
+            )
+
+    return lower, upper
+
+
+def benchmark_confidence_intervals() -> None:
+    data_interface = synthetic_data_interface(np.random.default_rng(0))
+    rates = BaseTools.error_rate_tree(data_interface)
+    counts = rates["count"].to_numpy().astype(np.int64)
+    n = rates["n"].to_numpy().astype(np.int64)
+    confidence = 0.95
+
+    cp.print_header(f"confidence intervals, {len(counts)} nodes x 3 error classes")
+    reference_methods = {"wilson": "wilson", "clopper-pearson": "exact"}
+    for method, reference_method in reference_methods.items():
+
+        def before():
+            return _reference_confidence_intervals(
+                counts, n, confidence, reference_method
+            )
+
+        def after():
+            return ConfidenceIntervals.interval(counts, n, confidence, method)
+
+        for expected, result in zip(before(), after()):
+            assert np.allclose(expected, result, equal_nan=True)
+        _report(method, _time(before, repeat=1), _time(after))
+
+    def before_bootstrap():
+        return _reference_bootstrap(counts, n, confidence, 1000)
+
+    def after_bootstrap():
+        return ConfidenceIntervals.interval(counts, n, confidence, "bootstrap")
+
+    # the resamples differ, so only check that the intervals hold the rates
+    lower, upper = after_bootstrap()
+    rate = counts / n[:, None]
+    assert ((lower <= rate) & (rate <= upper)).all()
+    _report("bootstrap", _time(before_bootstrap, repeat=1), _time(after_bootstrap))
+
+    def error_rate_tree(method: str):
+        # only the kept trees are cleared, the error classes and weights stay cached
+        data_interface._error_rate_trees = None
+        return BaseTools.error_rate_tree(data_interface, confidence, method)
+
+    # the normal approximation is what error_rate_tree() used before
+    times = {
+        method: _time(error_rate_tree, method)
+        for method in ConfidenceIntervals.methods
+    }
+    cp.print_bold("  error_rate_tree")
+    for method, seconds in times.items():
+        relative = seconds / times["normal"]
+        print(f"    {method}: {seconds:.4f} s ({relative:.1f}x normal)")
+
+
+def _reference_remaining_runs(
+    data_interface: DataInterface, target_width: float, confidence: float
+) -> pd.Series:
+    # one error_classification_confidence() call per node
+    errors = [SilentError.name, DataCorruptionError.name, CriticalError.name]
+    z = stats.norm.ppf(1 - (1 - confidence) / 2)
+    remaining = dict()
+    for node in PreOrderIter(data_interface.root):
+        n = data_interface.effective_sample_size(node)
+        if n < 2:
+            remaining[node.soc_path] = np.ceil(np.square(z / target_width) - n)
+            continue
+        error_class = BaseTools.error_classification(data_interface, node)
+        rates = error_class.value_counts(normalize=True)
+        width, _ = BaseTools.error_classification_confidence(
+            data_interface, node, confidence
+        )
+        width = width.reindex(errors, fill_value=0)
+        rates = rates.reindex(errors, fill_value=0)
+        p = np.clip(0.5, rates - width / 2, rates + width / 2)
+        needed = np.square(2 * z / target_width) * p * (1 - p)
+        per_error = np.where(
+            width <= target_width, 0, np.maximum(np.ceil(needed - n), 1)
+        )
+        remaining[node.soc_path] = per_error.max()
+
+    return pd.Series(remaining).astype(np.int64)
+
+
+def benchmark_remaining_runs() -> None:
+    data_interface = synthetic_data_interface(np.random.default_rng(0))
+    target_width = 0.05
+    seu_log = data_interface.seu_log
+
+    def before():
+        return _reference_remaining_runs(data_interface, target_width, 0.95)
+
+    def after():
+        # as after DataInterface.refresh(), nothing derived from the SeuLog is cached
+        data_interface.seu_log = seu_log
+        return BaseTools.remaining_runs(data_interface, target_width)
+
+    expected = before()
+    result = after()
+    assert (result["remaining_runs"].loc[expected.index] == expected).all()
+
+    cp.print_header(f"remaining_runs, SeuLog of {n_seu_log_rows} rows")
+    n_converged = int(result["converged"].sum())
+    print(f"  {n_converged} of {len(result)} nodes converged")
+    _report("all nodes, after an ingest", _time(before, repeat=1), _time(after))
+
+
+def _reference_multi_injection_runs(
+    n_runs: int, n_cells: int, n_trials: int
+) -> np.ndarray:
+    # every campaign drawn at once and counted with np.unique
+    rng = np.random.default_rng(0)
+    collided = np.zeros(n_trials, dtype=np.int64)
+    for trial in range(n_trials):
+        _, counts = np.unique(rng.integers(0, n_cells, n_runs), return_counts=True)
+        collided[trial] = counts[counts > 1].sum()
+
+    return collided
+
+
+def benchmark_multi_injection() -> None:
+    n_cycles = 478924
+    n_bits = 2806
+
+    cp.print_header("multi-injection simulation")
+    for n_runs, n_trials in [(100_000, 100), (10_000_000, 2)]:
+
+        def before():
+            return _reference_multi_injection_runs(n_runs, n_bits * n_cycles, n_trials)
+
+        def after():
+            return MultiInjection.simulate(n_runs, n_cycles, n_bits, n_trials)
+
+        def peak_memory(func: Callable) -> float:
+            tracemalloc.start()
+            func()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            return peak / 2**20
+
+        cp.print_bold(f"  {n_runs:,} runs, {n_trials} campaigns: peak memory")
+        print(f"    before: {peak_memory(before):.1f} MB")
+        print(f"    after:  {peak_memory(after):.1f} MB")
+        _report(
+            f"{n_runs:,} runs, {n_trials} campaigns",
+            _time(before, repeat=1),
+            _time(after, repeat=1),
+        )
+
+    # the mean of the simulation against the closed form, within 4 standard errors
+    widths = pd.Series(np.random.default_rng(0).integers(1, 33, 200))
+    for n_runs, bit_widths, per_register in [
+        (100_000, n_bits, False),
+        (20_000, widths, False),
+        (20_000, widths, True),
+    ]:
+        collided = MultiInjection.simulate(
+            n_runs, n_cycles // 100, bit_widths, 1000, per_register
+        )
+        expected = MultiInjection.expected_runs(
+            n_runs, n_cycles // 100, bit_widths, per_register
+        )
+        standard_error = collided.std() / np.sqrt(len(collided))
+        assert abs(collided.mean() - expected) < 4 * standard_error
+    closed_form = BaseTools.expected_num_multi_injection_runs(
+        n_cycles, n_bits, (10_000_000, 10_000_000)
+    ).iloc[0]
+    expected = MultiInjection.expected_runs(10_000_000, n_cycles, n_bits)
+    assert np.isclose(closed_form, expected)
+    print("  simulated means match the closed form")
+
+
+benchmarks = {
+    "log_matcher": benchmark_log_matcher,
+    "byte_scanning": benchmark_byte_scanning,
+    "head_tail_reading": benchmark_head_tail_reading,
+    "node_index": benchmark_node_index,
+    "register_tree": benchmark_register_tree,
+    "node_lookup": benchmark_node_lookup,
+    "windowed_error_rate": benchmark_windowed_error_rate,
+    "error_classification": benchmark_error_classification,
+    "error_rate_tree": benchmark_error_rate_tree,
+    "seu_log_schema": benchmark_seu_log_schema,
+    "seu_log_builder": benchmark_seu_log_builder,
+    "coverage": benchmark_coverage,
+    "interval_validation": benchmark_interval_validation,
+    "deduplication": benchmark_deduplication,
+    "optional_alerts": benchmark_optional_alerts,
+    "confidence_intervals": benchmark_confidence_intervals,
+    "remaining_runs": benchmark_remaining_runs,
+    "multi_injection": benchmark_multi_injection,
+}
+
+if __name__ == "__main__":
+    names = sys.argv[1:] if len(sys.argv) > 1 else list(benchmarks)
+    for name in names:
+        benchmarks[name]()
@@ -1,4 +1,4 @@
-from typing import List, Union, Tuple
+from typing import Union, Tuple
 
 import matplotlib.pyplot as plt
 import matplotlib as mpl
@@ -6,13 +6,12 @@ import pandas as pd
 import numpy as np
 import scipy.stats as stats
 
-
 from ..data_interface import DataInterface, Node
+from .confidence import ConfidenceIntervals
 from .structures.error_definitions import (
     SilentError,
     DataCorruptionError,
     CriticalError,
-    BaseError,
 )
 
 
@@ -25,33 +24,34 @@ class BaseTools:
         Used to classify the error type in each run of the seu log. The golden run
         object is used to compare against. For definitions of each error see the
         error_definitions.py file, or print out each error object from that same file.
-        """
-        seu_log = data_interface.get_seu_log_by_node(node)
-        golden_log = data_interface.golden_log
-
-        compare_cols = seu_log.columns.intersection(golden_log.index)
-        crit_cols = data_interface.run_info.comparison_data.entries
-        crit_cols += data_interface.run_info.seu_metadata.entries
 
-        is_critical = seu_log[crit_cols].isna().any(axis=1)
-        is_critical.name = CriticalError.name
+        All runs are classified once by the data interface (see
+        DataInterface.error_classes), so this only looks up the runs of the node.
 
-        is_corruption = seu_log[compare_cols].ne(golden_log).any(axis=1) & ~is_critical
-        is_corruption.name = DataCorruptionError.name
-
-        is_silent = ~(is_critical | is_corruption)
-        is_silent.name = SilentError.name
-
-        error_class = pd.Series([None] * len(seu_log), index=seu_log.index)
-        error_class[is_critical] = CriticalError.name
-        error_class[is_corruption] = DataCorruptionError.name
-        error_class[is_silent] = SilentError.name
+        The series has one error class per row of the SeuLog. The plot counts the runs
+        weighted by DataInterface.run_weights, i.e. the estimated number of runs of
+        each error class, which is the number of runs unless the runs are a stratified
+        sample or deduplicated.
+        """
+        error_class = data_interface.error_classes.iloc[
+            data_interface.get_rows_by_node(node)
+        ]
 
         if not visualize:
             return error_class
 
+        weights = data_interface.run_weights.iloc[data_interface.get_rows_by_node(node)]
+        counts = weights.groupby(error_class.to_numpy()).sum()
+        counts = counts.reindex(
+            [CriticalError.name, DataCorruptionError.name, SilentError.name],
+            fill_value=0,
+        )
         fig, ax = plt.subplots()
-        heights = [is_critical.sum(), is_corruption.sum(), is_silent.sum()]
+        heights = [
+            counts[CriticalError.name],
+            counts[DataCorruptionError.name],
+            counts[SilentError.name],
+        ]
         is_log = max(heights) > 10 * min(heights)
         ax.bar(
             x=[CriticalError.name, DataCorruptionError.name, SilentError.name],
@@ -62,7 +62,7 @@ class BaseTools:
         if is_log:
             ax.set_ylim(bottom=1)
 
-        ax.set_title(f"Error Classification: {seu_log.name}")
+        ax.set_title(f"Error Classification: {node.name}")
         ax.set_ylabel("Number of errors")
 
         fig.tight_layout()
@@ -70,6 +70,114 @@ class BaseTools:
 
         return error_class, fig
 
+    @classmethod
+    def error_rate_tree(
+        cls,
+        data_interface: DataInterface,
+        confidence: float = 0.95,
+        method: str = "normal",
+    ) -> pd.DataFrame:
+        """
+        Computes the number of runs of each error class, the error rates, and their
+        confidence intervals for every node in the register tree at once.
+
+        The runs are counted per register in one groupby over the error classes (see
+        DataInterface.error_classes), and the counts are summed bottom-up through the
+        tree (see DataInterface.sum_by_node()). The cost is therefore linear in the
+        number of runs plus the number of nodes, instead of one pass over the SeuLog
+        per node. The runs of a node are the runs on registers in its subtree.
+
+        The rates are weighted by DataInterface.run_weights, and the confidence
+        intervals are computed for all nodes at once (see
+        ConfidenceIntervals.interval()), with the effective sample size of each node.
+        Unless the runs are a stratified sample, all weights are 1, and n_eff is n.
+        The counts and n are numbers of runs, so a row standing for several runs (see
+        DataInterface.run_frequencies) is counted once per run.
+        Rates and intervals are NaN for nodes with no runs, and the normal intervals
+        are NaN for nodes with a single run.
+
+        The tree is kept by the data interface for each confidence and method until
+        the SeuLog changes (see DataInterface.get_error_rate_tree()), so later calls
+        only copy it.
+
+        :param data_interface: Data interface holding the SeuLog and register tree
+        :type data_interface: DataInterface
+        :param confidence: Confidence level of the intervals, defaults to 0.95
+        :type confidence: float, optional
+        :param method: Method of the confidence intervals, one of
+        ConfidenceIntervals.methods, defaults to "normal"
+        :type method: str, optional
+        :return: One row per node, indexed by SoC path in pre-order. The columns are
+        n (number of runs), n_eff (effective sample size), and count, rate, ci_lower
+        and ci_upper for each error class, as a two-level column index, e.g.
+        df["rate", CriticalError.name].
+        :rtype: pd.DataFrame
+        """
+        return data_interface.get_error_rate_tree(
+            confidence,
+            method,
+            lambda: cls._compute_error_rate_tree(data_interface, confidence, method),
+        )
+
+    @classmethod
+    def _compute_error_rate_tree(
+        cls, data_interface: DataInterface, confidence: float, method: str
+    ) -> pd.DataFrame:
+        """
+        Computes the table returned by error_rate_tree().
+        """
+        errors = [SilentError.name, DataCorruptionError.name, CriticalError.name]
+        error_classes = data_interface.error_classes
+        weights = data_interface.run_weights.to_numpy()
+        frequencies = data_interface.run_frequencies.to_numpy()
+        # squared weights of the runs the rows stand for, see effective_sample_size()
+        squared_weights = np.square(weights) / frequencies
+
+        one_hot = np.stack(
+            [(error_classes == error).to_numpy() for error in errors], axis=1
+        )
+        per_run = pd.DataFrame(
+            np.hstack(
+                [
+                    # runs, not rows, after IntervalValidation.deduplicate()
+                    one_hot * frequencies[:, None],
+                    one_hot * weights[:, None],
+                    weights[:, None],
+                    squared_weights[:, None],
+                ]
+            )
+        )
+        per_register = per_run.groupby(
+            data_interface.seu_log["register"].to_numpy(), sort=False
+        ).sum()
+
+        sums = data_interface.sum_by_node(per_register)
+        counts = sums.iloc[:, : len(errors)].to_numpy()
+        weighted_counts = sums.iloc[:, len(errors) : 2 * len(errors)].to_numpy()
+        weight_sums = sums.iloc[:, [2 * len(errors)]].to_numpy()
+        squared_weight_sums = sums.iloc[:, [2 * len(errors) + 1]].to_numpy()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            n = np.square(weight_sums) / squared_weight_sums
+            rates = weighted_counts / weight_sums
+        ci_lower, ci_upper = ConfidenceIntervals.interval(
+            rates * n, n, confidence, method
+        )
+
+        columns = {
+            ("n", ""): counts.sum(axis=1).round().astype(np.int64),
+            ("n_eff", ""): np.nan_to_num(n[:, 0]),
+        }
+        for values, stat in [
+            (counts.round().astype(np.int64), "count"),
+            (rates, "rate"),
+            (ci_lower, "ci_lower"),
+            (ci_upper, "ci_upper"),
+        ]:
+            for i, error in enumerate(errors):
+                columns[(stat, error)] = values[:, i]
+
+        return pd.DataFrame(columns, index=sums.index)
+
     @classmethod
     def windowed_error_rate(
         cls,
@@ -79,23 +187,38 @@ class BaseTools:
         window_size: int = 150,
         confidence: float = 0.95,
         visualize: bool = False,
+        method: str = "normal",
     ) -> Union[
         Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame],
         Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, plt.figure],
     ]:
-        # https://en.wikipedia.org/wiki/Algorithms_for_calculating_variance
-        # See Welford's online algorithm for faster implementation of std estimate
         """
         If you SeuLog has an entry corresponding to a time value, this method can be
         used to visualize how that error rate changes over time.
 
+        The column must be numeric, e.g. injection_cycle, which the SeuLog stores as
+        Float64 (see SeuLog.float_columns).
+
         This method creates an error_classification series based on
         cls.error_classification(), and then uses a window in time to estimate the error
         rate by taking n_error_rate_in_window / n_injection_in_window for each type of
         error.
 
+        The number of errors in every window is computed at once from cumulative sums
+        of the one-hot encoded error classes, so the cost is linear in the number of
+        runs, independent of the window size.
+
+        The rates are weighted by DataInterface.run_weights, and the intervals use the
+        effective sample size of each window, as in error_rate_tree(). Unless the runs
+        are a stratified sample, all weights are 1, and the effective sample size of a
+        window is window_size. A window is window_size rows of the SeuLog, which are
+        more runs if the rows stand for several runs (see
+        DataInterface.run_frequencies).
+
         The confidence bands are calculated pointwise, to create something akin to
-        confidence bands, keep this in mind when interpreting the visualization.
+        confidence bands, keep this in mind when interpreting the visualization. The
+        intervals of all windows are computed at once, by the given method (see
+        ConfidenceIntervals.interval()).
         """
         assert window_size % 2 == 0, "window_size in windowed_error_rate must be even"
 
@@ -105,52 +228,63 @@ class BaseTools:
         )
 
         n = len(error_classifications)
-        z = stats.norm.ppf(1 - (1 - confidence) / 2)
         errors = [SilentError.name, DataCorruptionError.name, CriticalError.name]
+        times = seu_log[injection_time_col].to_numpy(dtype=float, na_value=np.nan)
 
         df = pd.DataFrame(
             columns=errors,
             data=np.zeros((n, len(errors))),
-            index=seu_log[injection_time_col].astype(float),
+            index=pd.Index(times, name=injection_time_col),
         ).sort_index()
 
         conf_lower = df.copy()
         conf_upper = df.copy()
 
         error_classifications = error_classifications.to_frame()
-        error_classifications[injection_time_col] = seu_log.copy()[
-            injection_time_col
-        ].astype(float)
+        rows = data_interface.get_rows_by_node(node)
+        frequencies = data_interface.run_frequencies.to_numpy()[rows]
+        error_classifications["weight"] = data_interface.run_weights.to_numpy()[rows]
+        error_classifications["frequency"] = frequencies
+        error_classifications[injection_time_col] = times
         error_classifications.sort_values(injection_time_col, inplace=True)
-        error_classifications.drop(columns=[injection_time_col], inplace=True)
-        error_classifications = error_classifications.squeeze()
-
-        def confidence_and_error_rate(
-            error_class: pd.Series, z: float = z, errors: List[BaseError] = errors
-        ) -> Tuple[pd.Series, float]:
-            _dummies = pd.get_dummies(error_class)
-            for _e in errors:
-                if _e not in _dummies.columns:
-                    _dummies[_e] = np.zeros(len(_dummies)).astype(bool)
-
-            _std = _dummies.std()
-            _ci = z * _std / np.sqrt(len(_dummies))
-            _dfr = _dummies.sum() / len(_dummies)
+        weights = error_classifications["weight"].to_numpy()
+        squared_weights = (
+            np.square(weights) / error_classifications["frequency"].to_numpy()
+        )
+        error_classifications = error_classifications.iloc[:, 0]
 
-            return _dfr, _ci
+        one_hot = np.stack(
+            [(error_classifications == error).to_numpy() for error in errors], axis=1
+        )
+        cumulative = np.zeros((n + 1, len(errors) + 2))
+        np.cumsum(
+            np.column_stack([one_hot * weights[:, None], weights, squared_weights]),
+            axis=0,
+            out=cumulative[1:],
+        )
 
+        # window i covers the runs i - ws_2 up to (not including) i + ws_2
         ws_2 = window_size // 2
-        for i in range(ws_2, n - ws_2):
-            rates, ci = confidence_and_error_rate(
-                error_class=error_classifications[i - ws_2 : i + ws_2]
-            )
-            df.iloc[i] = rates
-            conf_lower.iloc[i] = rates - ci
-            conf_upper.iloc[i] = rates + ci
+        centers = np.arange(ws_2, n - ws_2)
+        sums = cumulative[centers + ws_2] - cumulative[centers - ws_2]
+        weighted_counts = sums[:, : len(errors)]
+        weight_sums = sums[:, [len(errors)]]
+        squared_weight_sums = sums[:, len(errors) + 1]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rates = weighted_counts / weight_sums
+            n_eff = np.square(weight_sums[:, 0]) / squared_weight_sums
+        lower, upper = ConfidenceIntervals.interval(
+            rates * n_eff[:, None], n_eff, confidence, method
+        )
+
+        df.iloc[centers] = rates
+        conf_lower.iloc[centers] = lower
+        conf_upper.iloc[centers] = upper
 
         if not visualize:
             return df, conf_lower, conf_upper
-        cycle = df.index.values.astype(float)
+        cycle = df.index.values
         c = df[CriticalError.name].values
         cl = conf_lower[CriticalError.name].values
         cu = conf_upper[CriticalError.name].values
@@ -224,26 +358,47 @@ class BaseTools:
         node: Node,
         confidence: float = 0.95,
         visualize: bool = False,
+        method: str = "normal",
     ) -> Union[Tuple[pd.Series, pd.Series], Tuple[pd.Series, plt.Figure]]:
         """
-        Calculates the confidence intervals for the given error rate estimates.
+        Calculates the confidence intervals for the given error rate estimates, and
+        returns the size of each interval.
+
+        The rates are weighted by DataInterface.run_weights, and the intervals use the
+        effective sample size of the node (see DataInterface.effective_sample_size()).
+        Unless the runs are a stratified sample, all weights are 1, and the effective
+        sample size is the number of runs. The intervals are computed by the given
+        method (see ConfidenceIntervals.interval()), and are not symmetric around the
+        rates, except for the normal approximation.
         """
         seu_log = data_interface.get_seu_log_by_node(node)
 
         ec = BaseTools.error_classification(data_interface, node, visualize=False)
+        weights = data_interface.run_weights.iloc[
+            data_interface.get_rows_by_node(node)
+        ].to_numpy()
+        n = data_interface.effective_sample_size(node)
+
         ec_onehot = pd.get_dummies(ec)
-        n = len(ec)
-        rates = ec.value_counts(normalize=True)
-        std = ec_onehot.std()
-        z = stats.norm.ppf(1 - (1 - confidence) / 2)
-        ci = z * std / np.sqrt(n)
+        rates = ec_onehot.mul(weights, axis=0).sum() / weights.sum()
+        # sample standard deviation of the one-hot columns, as pd.DataFrame.std()
+        std = np.sqrt(rates * (1 - rates) * n / (n - 1))
+        lower, upper = ConfidenceIntervals.interval(
+            rates.to_numpy() * n, n, confidence, method
+        )
+        lower = pd.Series(lower[0], index=rates.index)
+        upper = pd.Series(upper[0], index=rates.index)
+        ci_size = upper - lower
 
         if not visualize:
-            return ci * 2, std
+            return ci_size, std
 
         name_list = [CriticalError.name, DataCorruptionError.name, SilentError.name]
         fig, ax = plt.subplots()
-        fig.suptitle(f"#Samples: {n}")
+        if n == len(ec):
+            fig.suptitle(f"#Samples: {len(ec)}")
+        else:
+            fig.suptitle(f"#Samples: {len(ec)} (effective: {n:.0f})")
         ax.bar(
             rates[name_list].index,
             rates[name_list],
@@ -252,7 +407,10 @@ class BaseTools:
         ax.errorbar(
             rates[name_list].index,
             rates[name_list],
-            yerr=ci[name_list],
+            yerr=[
+                rates[name_list] - lower[name_list],
+                upper[name_list] - rates[name_list],
+            ],
             fmt="none",
             ecolor="black",
             capsize=5,
@@ -263,13 +421,107 @@ class BaseTools:
 
         for i, name in enumerate(name_list):
             text = f"$\sigma={{{std[name]:.1e}}}$\n"
-            text += f"CI size: {2*ci[name]:.1e}\n"
+            text += f"CI size: {ci_size[name]:.1e}\n"
             ax.text(i - 0.2, text_height, text, color="black")
 
         ax.set_title(f"Error Classification: {seu_log.name}")
         fig.show()
 
-        return ci * 2, fig
+        return ci_size, fig
+
+    @classmethod
+    def remaining_runs(
+        cls,
+        data_interface: DataInterface,
+        target_width: Union[float, pd.Series, pd.DataFrame],
+        confidence: float = 0.95,
+        method: str = "normal",
+    ) -> pd.DataFrame:
+        """
+        Estimates how many more runs must be injected into the subtree of every node
+        before the confidence intervals of its error rates are at most target_width
+        wide, to decide which parts of the register tree need more injections while a
+        campaign runs. A node has converged when the intervals of all its error
+        classes are narrow enough.
+
+        The number of runs a node needs is found from the width of the normal
+        interval, 2 * z * sqrt(p * (1 - p) / n), with p the rate in the current
+        interval which is closest to 0.5. Using the worst rate of the interval keeps
+        the estimate from being 0 for rare error classes which have not been seen
+        yet, and nodes with no runs are planned with p = 0.5. The estimate is in
+        effective runs, and is scaled by n / n_eff to runs, as weighted runs are
+        worth less than independent ones (see DataInterface.run_weights).
+
+        Everything is computed from error_rate_tree() in one pass, so the estimate is
+        cheap to recompute after every DataInterface.refresh().
+
+        :param data_interface: Data interface holding the SeuLog and register tree
+        :type data_interface: DataInterface
+        :param target_width: Largest width (ci_upper - ci_lower) of the confidence
+        intervals. Either one width for all nodes and error classes, one width per
+        error class as a series indexed by error class, or one width per node and
+        error class as a dataframe indexed by SoC path, with the error classes as
+        columns. Nodes missing from the dataframe, and NaN widths, have no target.
+        :type target_width: Union[float, pd.Series, pd.DataFrame]
+        :param confidence: Confidence level of the intervals, defaults to 0.95
+        :type confidence: float, optional
+        :param method: Method of the confidence intervals, one of
+        ConfidenceIntervals.methods, defaults to "normal". The current widths use the
+        method, the number of remaining runs always uses the normal interval.
+        :type method: str, optional
+        :return: One row per node, indexed by SoC path in pre-order. The columns are
+        n, n_eff, width, target_width and remaining for each error class, as a
+        two-level column index like error_rate_tree(), remaining_runs (the most runs
+        needed by any error class), and converged.
+        :rtype: pd.DataFrame
+        """
+        errors = [SilentError.name, DataCorruptionError.name, CriticalError.name]
+        tree = cls.error_rate_tree(data_interface, confidence, method)
+
+        if isinstance(target_width, pd.DataFrame):
+            targets = target_width.reindex(index=tree.index, columns=errors)
+        elif isinstance(target_width, pd.Series):
+            targets = pd.DataFrame(
+                np.tile(target_width.reindex(errors).to_numpy(), (len(tree), 1)),
+                index=tree.index,
+                columns=errors,
+            )
+        else:
+            targets = pd.DataFrame(target_width, index=tree.index, columns=errors)
+        targets = targets.to_numpy(dtype=float)
+
+        lower = tree["ci_lower"][errors].to_numpy()
+        upper = tree["ci_upper"][errors].to_numpy()
+        n = tree["n"].to_numpy()[:, None]
+        n_eff = tree["n_eff"].to_numpy()[:, None]
+
+        z = stats.norm.ppf(1 - (1 - confidence) / 2)
+        # the rate of the interval which gives the widest normal interval
+        p = np.where(np.isnan(lower), 0.5, np.clip(0.5, lower, upper))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            needed = np.square(2 * z / targets) * p * (1 - p)
+            design_effect = np.where(n_eff > 0, n / n_eff, 1.0)
+        # nodes with no interval (no runs, or a single run) are not converged
+        width = upper - lower
+        converged = (width <= targets) | np.isnan(targets)
+        remaining = np.where(
+            converged, 0, np.ceil(np.clip(needed - n_eff, 0, None) * design_effect)
+        )
+        # the interval of the method can be wider than the normal one it is planned by
+        remaining = np.where(converged, 0, np.maximum(remaining, 1)).astype(np.int64)
+
+        columns = {("n", ""): tree["n"], ("n_eff", ""): tree["n_eff"]}
+        for values, stat in [
+            (width, "width"),
+            (targets, "target_width"),
+            (remaining, "remaining"),
+        ]:
+            for i, error in enumerate(errors):
+                columns[(stat, error)] = values[:, i]
+        columns[("remaining_runs", "")] = remaining.max(axis=1)
+        columns[("converged", "")] = converged.all(axis=1)
+
+        return pd.DataFrame(columns, index=tree.index)
 
     @classmethod
     def expected_num_multi_injection_runs(
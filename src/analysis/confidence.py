@@ -0,0 +1,170 @@
+from typing import Tuple
+
+import numpy as np
+import scipy.stats as stats
+
+
+class ConfidenceIntervals:
+    methods: Tuple[str, ...] = ("normal", "wilson", "clopper-pearson", "bootstrap")
+
+    # largest number of bootstrap draws held in memory at once
+    bootstrap_batch_size: int = 2**22
+
+    @classmethod
+    def interval(
+        cls,
+        counts: np.ndarray,
+        n: np.ndarray,
+        confidence: float = 0.95,
+        method: str = "normal",
+        n_bootstrap: int = 1000,
+        seed: int = 0,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Computes confidence intervals for the error rates of many groups of runs at
+        once, e.g. every node of the register tree, or every window in time. Each row
+        holds the number of runs of each error class in a group, and the rates are
+        counts / n.
+
+        The methods are:
+
+        - normal: the normal approximation used by the tools so far, with the sample
+          standard deviation of the one-hot error classes. Breaks down for rates near
+          0 or 1, i.e. for rare error classes.
+        - wilson: the Wilson score interval.
+        - clopper-pearson: the exact binomial interval, from the quantiles of the beta
+          distribution.
+        - bootstrap: the percentile interval of n_bootstrap multinomial resamples of
+          every group, drawn in batches.
+
+        Counts and n do not have to be integers, e.g. weighted counts with the
+        effective sample size as n. The bootstrap rounds n to the nearest integer.
+        Intervals are NaN for groups with no runs, and for groups with a single run
+        with the normal method.
+
+        :param counts: Number of runs of each error class, one row per group and one
+        column per error class
+        :type counts: np.ndarray
+        :param n: Number of runs of each group
+        :type n: np.ndarray
+        :param confidence: Confidence level of the intervals, defaults to 0.95
+        :type confidence: float, optional
+        :param method: One of cls.methods, defaults to "normal"
+        :type method: str, optional
+        :param n_bootstrap: Number of resamples of the bootstrap, defaults to 1000
+        :type n_bootstrap: int, optional
+        :param seed: Seed of the bootstrap resamples, defaults to 0
+        :type seed: int, optional
+        :raises ValueError: Raised if the method is not one of cls.methods
+        :return: Lower and upper bounds of the intervals, in the shape of counts
+        :rtype: Tuple[np.ndarray, np.ndarray]
+        """
+        if method not in cls.methods:
+            raise ValueError(f"Unknown method {method}, use one of {cls.methods}.")
+
+        counts = np.asarray(counts, dtype=float)
+        if counts.ndim == 1:
+            counts = counts[None, :]
+        n = np.broadcast_to(
+            np.asarray(n, dtype=float).reshape(-1, 1), counts.shape
+        ).copy()
+        n[n <= 0] = np.nan
+
+        if method == "normal":
+            lower, upper = cls._normal(counts, n, confidence)
+        elif method == "wilson":
+            lower, upper = cls._wilson(counts, n, confidence)
+        elif method == "clopper-pearson":
+            lower, upper = cls._clopper_pearson(counts, n, confidence)
+        else:
+            lower, upper = cls._bootstrap(counts, n, confidence, n_bootstrap, seed)
+
+        return lower, upper
+
+    @classmethod
+    def _normal(
+        cls, counts: np.ndarray, n: np.ndarray, confidence: float
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        z = stats.norm.ppf(1 - (1 - confidence) / 2)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rates = counts / n
+            # sample standard deviation of the one-hot columns, as pd.DataFrame.std()
+            std = np.sqrt(rates * (1 - rates) * n / (n - 1))
+            ci = z * std / np.sqrt(n)
+
+        return rates - ci, rates + ci
+
+    @classmethod
+    def _wilson(
+        cls, counts: np.ndarray, n: np.ndarray, confidence: float
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        z = stats.norm.ppf(1 - (1 - confidence) / 2)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rates = counts / n
+            denominator = 1 + z**2 / n
+            center = (rates + z**2 / (2 * n)) / denominator
+            half_width = (
+                z
+                * np.sqrt(rates * (1 - rates) / n + z**2 / (4 * np.square(n)))
+                / denominator
+            )
+
+        return center - half_width, center + half_width
+
+    @classmethod
+    def _clopper_pearson(
+        cls, counts: np.ndarray, n: np.ndarray, confidence: float
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        alpha = 1 - confidence
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            lower = stats.beta.ppf(alpha / 2, counts, n - counts + 1)
+            upper = stats.beta.ppf(1 - alpha / 2, counts + 1, n - counts)
+
+        # the beta distribution is not defined at the edges, where the bounds are 0, 1
+        lower = np.where((counts <= 0) & ~np.isnan(n), 0.0, lower)
+        upper = np.where((counts >= n) & ~np.isnan(n), 1.0, upper)
+
+        return lower, upper
+
+    @classmethod
+    def _bootstrap(
+        cls,
+        counts: np.ndarray,
+        n: np.ndarray,
+        confidence: float,
+        n_bootstrap: int,
+        seed: int,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        alpha = 1 - confidence
+        rng = np.random.default_rng(seed)
+
+        trials = np.nan_to_num(np.round(n[:, 0])).astype(np.int64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            probabilities = np.nan_to_num(counts / n)
+        # the multinomial needs probabilities which sum to 1, the remainder is only
+        # there if the error classes do not cover all runs
+        remainder = np.clip(1 - probabilities.sum(axis=1, keepdims=True), 0, None)
+        probabilities = np.hstack([probabilities, remainder])
+        probabilities /= probabilities.sum(axis=1, keepdims=True)
+
+        lower = np.full(counts.shape, np.nan)
+        upper = np.full(counts.shape, np.nan)
+        valid = np.flatnonzero(trials > 0)
+
+        rows_per_batch = max(
+            1, cls.bootstrap_batch_size // (n_bootstrap * probabilities.shape[1])
+        )
+        for start in range(0, len(valid), rows_per_batch):
+            rows = valid[start : start + rows_per_batch]
+            draws = rng.multinomial(
+                trials[rows], probabilities[rows], size=(n_bootstrap, len(rows))
+            )
+            rates = draws[:, :, : counts.shape[1]] / trials[rows][None, :, None]
+            lower[rows], upper[rows] = np.quantile(
+                rates, [alpha / 2, 1 - alpha / 2], axis=0
+            )
+
+        return lower, upper
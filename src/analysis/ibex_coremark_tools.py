@@ -1,4 +1,4 @@
-from typing import Tuple, Union, Dict
+from typing import Tuple, Union
 
 import matplotlib.pyplot as plt
 import pandas as pd
@@ -23,7 +23,10 @@ class IbexCoremarkTools(BaseTools):
 
         This method takes all unique register names in the SeuLog (all ancestor nodes)
         and computes the propoertion of errors on each one. Then it returns a dataframe
-        with these error propoertions.
+        with these error propoertions. The proportions are taken from
+        cls.error_rate_tree(), which the data interface keeps, so the tree is only
+        computed once however many nodes are stacked. The runs of a child are the
+        runs of its subtree, the same as DataInterface.get_seu_log_by_node().
 
         The most usefel part of this method is visualizing and comparing the
         distribution of errors visualize for all unique ancestors of a node (in the
@@ -31,24 +34,12 @@ class IbexCoremarkTools(BaseTools):
 
         :param filter: If True, remove zero register from plot
         """
-        children: Dict[str, Node] = {child.name: child for child in node.children}
+        rates = cls.error_rate_tree(data_interface)["rate"]
 
-        error_classes = {
-            name: cls.error_classification(data_interface, child_node, False)
-            for name, child_node in children.items()
-        }
-
-        value_counts = {
-            name: error_class.value_counts()
-            for name, error_class in error_classes.items()
-        }
-
-        proportions = {
-            name: value_count / value_count.sum()
-            for name, value_count in value_counts.items()
-        }
-
-        df = pd.DataFrame(proportions).fillna(0).T
+        df = rates.loc[[child.soc_path for child in node.children]]
+        df.index = [child.name for child in node.children]
+        df.columns.name = None
+        df = df.fillna(0)
 
         if not visualize:
             return df
@@ -17,36 +17,43 @@ class IbexHwsecCoremarkTools(IbexCoremarkTools):
     def alert_classification(
         cls, data_interface: DataInterface, node: Node, visualize: bool = False
     ) -> Union[pd.DataFrame, Tuple[pd.DataFrame, plt.Figure]]:
+        """
+        Classifies the errors of the runs of a node, and whether each run raised an
+        alert.
+
+        The dataframe has one row per row of the SeuLog, with 0/1 columns, so its sums
+        are unweighted. Multiply by DataInterface.run_weights for estimated numbers of
+        runs if the runs are a stratified sample or deduplicated. The plot uses the
+        weighted numbers.
+        """
         seu_log = data_interface.get_seu_log_by_node(node)
+        weights = data_interface.run_weights.iloc[
+            data_interface.get_rows_by_node(node)
+        ].to_numpy()
         error_classifications = cls.error_classification(data_interface, node, False)
 
         # get optional data related to this method
-        node_runs = list(seu_log.index)
-        node_optional = data_interface.optional_data.get_data_by_runs(node_runs)
-
-        # generate a df with boolean map where true indicates alert raised
-        node_optional_df = pd.DataFrame.from_dict(
-            {seu_run: alerts is not None for seu_run, alerts in node_optional.items()},
-            orient="index",
-            columns=["alert"],
-        )
-        alert_series = node_optional_df["alert"].astype(int)
+        optional_data = data_interface.optional_data
+        alert_summary = optional_data.get_alert_summary(list(seu_log.index))
+        # 1 where an alert was raised
+        alert_series = alert_summary[optional_data.any_alert_name].astype(int)
 
         critical_error = error_classifications == CriticalError.name
         corruption_error = error_classifications == DataCorruptionError.name
         silent_error = error_classifications == SilentError.name
 
+        weighted_alerts = alert_series * weights
         alert_heights = [
-            alert_series[critical_error].sum(),
-            alert_series[corruption_error].sum(),
-            alert_series[silent_error].sum(),
+            weighted_alerts[critical_error].sum(),
+            weighted_alerts[corruption_error].sum(),
+            weighted_alerts[silent_error].sum(),
         ]
 
         critical_error = critical_error.astype(int)
         corruption_error = corruption_error.astype(int)
         silent_error = silent_error.astype(int)
 
-        time_index = seu_log["injection_cycle"].astype(float)
+        time_index = seu_log["injection_cycle"]
 
         df = pd.DataFrame(
             {
@@ -62,9 +69,9 @@ class IbexHwsecCoremarkTools(IbexCoremarkTools):
 
         fig, ax = plt.subplots()
         error_heights = [
-            critical_error.sum(),
-            corruption_error.sum(),
-            silent_error.sum(),
+            (critical_error * weights).sum(),
+            (corruption_error * weights).sum(),
+            (silent_error * weights).sum(),
         ]
         [a / e for a, e in zip(alert_series, error_heights)]
         is_log = max(error_heights) > 10 * min(error_heights)
@@ -86,7 +93,7 @@ class IbexHwsecCoremarkTools(IbexCoremarkTools):
 
         # Insert # of runs on to bar
         for container in ax.containers:
-            ax.bar_label(container)
+            ax.bar_label(container, fmt="%.0f")
         ax.legend()
 
         if is_log:
@@ -0,0 +1,372 @@
+from typing import Sequence, Tuple
+import copy
+
+import pandas as pd
+import numpy as np
+
+from ..data_interface import DataInterface, Node
+from .base_tools import BaseTools
+from .structures.seu_log import SeuLog
+from .structures.error_definitions import SilentError
+
+
+# injections with the same register, encoded cycle, and bit number are equivalent
+default_equivalence_keys = ("register", "encoded_cycle", "bit_number")
+
+
+class IntervalValidation:
+    @classmethod
+    def simulation_time_to_cycle(cls, times: pd.Series) -> pd.Series:
+        """
+        Converts the simulation times the SEUs are injected at to clock cycles, for the
+        Ibex testbench: times are rounded up to a multiple of 5, shifted by 20, and
+        divided by the clock period of 10. Missing times stay missing.
+
+        :param times: Simulation times of the injections, e.g. the injection_cycle
+        column of the SeuLog, which is Float64 (see SeuLog.float_columns)
+        :type times: pd.Series
+        :return: Clock cycles of the injections
+        :rtype: pd.Series
+        """
+        rounded = times + (5 - times % 5) % 5
+
+        return (rounded + 20) / 10 - 1
+
+    @classmethod
+    def injection_table(
+        cls,
+        data_interface: DataInterface,
+        node: Node,
+        inject_intervals: pd.DataFrame,
+        number_of_registers: int = 32,
+        injection_cycle_column: str = "injection_cycle",
+        bit_number_column: str = "bit_number",
+        seed_column: str = "uvm_seed",
+    ) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Looks up the encoded cycle of every injection in a register file in the table
+        of injection intervals. The table has one row per clock cycle, and one column
+        per architectural register (x0, x1, ...). A value of 0 means the register is
+        not sensitive at that cycle, and injections with the same non-zero value in
+        the same register are expected to behave the same (see equivalence_classes()).
+
+        The register number of each run is parsed once per distinct register, and
+        the table is indexed by the positions of all runs at once.
+
+        :param data_interface: Data interface with the SeuLog of the campaign
+        :type data_interface: DataInterface
+        :param node: Node of the register file, e.g. register_file_i
+        :type node: Node
+        :param inject_intervals: Encoded cycle of every register at every clock cycle,
+        indexed by clock cycle
+        :type inject_intervals: pd.DataFrame
+        :param number_of_registers: Number of registers in the register file. rf_reg[i]
+        is register x(number_of_registers - 1 - i), defaults to 32
+        :type number_of_registers: int, optional
+        :param injection_cycle_column: Column of the SeuLog with the clock cycle of
+        the injection, defaults to "injection_cycle"
+        :type injection_cycle_column: str, optional
+        :param bit_number_column: Column of the SeuLog with the flipped bit, defaults
+        to "bit_number"
+        :type bit_number_column: str, optional
+        :param seed_column: Column of the SeuLog with the seed of the run, defaults to
+        "uvm_seed"
+        :type seed_column: str, optional
+        :return: One row per run found in the table, with the register, injection
+        cycle, bit number, seed, error class, whether the run is silent, whether the
+        injection is sensitive, and the encoded cycle. And the runs which are not in
+        the table, with their register and injection cycle.
+        :rtype: Tuple[pd.DataFrame, pd.DataFrame]
+        """
+        seu_log = data_interface.get_seu_log_by_node(node)
+        error_class = BaseTools.error_classification(data_interface, node)
+
+        registers = pd.Categorical(seu_log["register"]).remove_unused_categories()
+        indexes = pd.Series(registers.categories.astype(str))
+        indexes = pd.to_numeric(
+            indexes.str.split("[").str[1].str.strip("]"), errors="coerce"
+        )
+        names = "x" + (number_of_registers - 1 - indexes).astype("Int64").astype(str)
+        names = names.where(indexes.notna(), None).to_numpy(dtype=object)
+        register_names = names[registers.codes]
+
+        # the cycles are truncated, so half cycles are rounded down
+        cycles = seu_log[injection_cycle_column].to_numpy(dtype=float, na_value=np.nan)
+        cycles = np.trunc(cycles)
+        has_cycle = ~np.isnan(cycles)
+
+        row_positions = np.full(len(seu_log), -1, dtype=np.int64)
+        row_positions[has_cycle] = inject_intervals.index.get_indexer(
+            cycles[has_cycle].astype(np.int64)
+        )
+        column_positions = inject_intervals.columns.get_indexer(register_names)
+        found = (row_positions >= 0) & (column_positions >= 0)
+
+        encoded_cycles = inject_intervals.to_numpy()[
+            row_positions[found], column_positions[found]
+        ]
+        is_silent = (error_class == SilentError.name).to_numpy()
+
+        table = pd.DataFrame(
+            {
+                "register": pd.Categorical(register_names[found]),
+                "injection_cycle": cycles[found].astype(np.int64),
+                "bit_number": cls._to_integers(seu_log[bit_number_column])[found],
+                "seed": cls._to_integers(seu_log[seed_column])[found],
+                "error_class": error_class.array[found],
+                "is_silent": is_silent[found],
+                "is_sensitive": encoded_cycles != 0,
+                "encoded_cycle": encoded_cycles.astype(np.int64),
+            },
+            index=seu_log.index[found],
+        )
+
+        missing = pd.DataFrame(
+            {
+                "register": register_names[~found],
+                "injection_cycle": pd.Series(cycles[~found]).astype("Int64").array,
+            },
+            index=seu_log.index[~found],
+        )
+
+        return table, missing
+
+    @classmethod
+    def confusion_matrix(cls, table: pd.DataFrame) -> pd.DataFrame:
+        """
+        Counts the runs by whether the injection is sensitive, and whether the run is
+        silent. Non-silent runs of non-sensitive injections are false negatives of the
+        injection intervals, and should not exist.
+
+        :param table: Runs as returned by injection_table()
+        :type table: pd.DataFrame
+        :return: Number of runs, with is_sensitive (True, False) as the index and
+        is_silent (True, False) as the columns
+        :rtype: pd.DataFrame
+        """
+        return pd.crosstab(table["is_sensitive"], table["is_silent"]).reindex(
+            index=[True, False], columns=[True, False], fill_value=0
+        )
+
+    @classmethod
+    def false_negatives(cls, table: pd.DataFrame) -> pd.DataFrame:
+        """
+        :param table: Runs as returned by injection_table()
+        :type table: pd.DataFrame
+        :return: Runs where the injection is not sensitive, but the run is not silent
+        :rtype: pd.DataFrame
+        """
+        return table[~table["is_silent"] & ~table["is_sensitive"]]
+
+    @classmethod
+    def equivalence_classes(
+        cls,
+        table: pd.DataFrame,
+        equivalence_keys: Sequence[str] = default_equivalence_keys,
+    ) -> pd.DataFrame:
+        """
+        Groups the sensitive injections into classes of equivalent injections, which
+        have the same register, encoded cycle, and bit number, and checks that all
+        runs of each class have the same error class.
+
+        :param table: Runs as returned by injection_table()
+        :type table: pd.DataFrame
+        :param equivalence_keys: Columns of the table which make injections
+        equivalent, defaults to register, encoded cycle, and bit number
+        :type equivalence_keys: Sequence[str], optional
+        :return: One row per class, indexed by the equivalence keys, with the number
+        of runs, the number of distinct error classes, and whether the class is
+        consistent (a single error class)
+        :rtype: pd.DataFrame
+        """
+        sensitive = table[table["encoded_cycle"] != 0]
+        groups = sensitive.groupby(list(equivalence_keys), observed=True)[
+            "error_class"
+        ]
+
+        classes = pd.DataFrame(
+            {"n_runs": groups.size(), "n_error_classes": groups.nunique()}
+        )
+        classes["consistent"] = classes["n_error_classes"] == 1
+
+        return classes
+
+    @classmethod
+    def inconsistent_injections(
+        cls,
+        table: pd.DataFrame,
+        equivalence_keys: Sequence[str] = default_equivalence_keys,
+    ) -> pd.DataFrame:
+        """
+        :param table: Runs as returned by injection_table()
+        :type table: pd.DataFrame
+        :param equivalence_keys: Columns of the table which make injections
+        equivalent, defaults to register, encoded cycle, and bit number
+        :type equivalence_keys: Sequence[str], optional
+        :return: Runs of the equivalence classes with more than one error class (see
+        equivalence_classes()), numbered by class in the equivalence_class column
+        :rtype: pd.DataFrame
+        """
+        sensitive = table[table["encoded_cycle"] != 0]
+        groups = sensitive.groupby(list(equivalence_keys), observed=True)
+        n_error_classes = groups["error_class"].transform("nunique")
+
+        inconsistent = sensitive[n_error_classes > 1]
+        equivalence_class = inconsistent.groupby(
+            list(equivalence_keys), observed=True
+        ).ngroup()
+        inconsistent = inconsistent.assign(equivalence_class=equivalence_class)
+
+        return inconsistent.sort_values("equivalence_class", kind="stable")
+
+    @classmethod
+    def deduplicated_table(
+        cls,
+        table: pd.DataFrame,
+        equivalence_keys: Sequence[str] = default_equivalence_keys,
+    ) -> pd.DataFrame:
+        """
+        Collapses the runs of each equivalence class into one row per error class
+        seen in the class, weighted by the number of runs it stands for. Injections
+        which are not sensitive are collapsed per register and bit number, as they are
+        all expected to be silent.
+
+        Keeping one row per error class, rather than one per equivalence class, means
+        the rates weighted by multiplicity are exactly the rates over all runs, also
+        for classes where the assumption does not hold.
+
+        :param table: Runs as returned by injection_table()
+        :type table: pd.DataFrame
+        :param equivalence_keys: Columns of the table which make injections
+        equivalent, defaults to register, encoded cycle, and bit number
+        :type equivalence_keys: Sequence[str], optional
+        :return: One row per equivalence class and error class, indexed by the
+        equivalence keys and the error class, with the multiplicity (number of
+        runs), the first of these runs as the representative run, and whether the
+        equivalence class is consistent
+        :rtype: pd.DataFrame
+        """
+        keys = list(equivalence_keys) + ["error_class"]
+        runs = pd.Series(table.index, index=table.index, name="run")
+        groups = runs.groupby([table[key] for key in keys], observed=True)
+
+        deduplicated = pd.DataFrame(
+            {"multiplicity": groups.size(), "representative_run": groups.first()}
+        )
+        n_error_classes = deduplicated.groupby(
+            level=list(equivalence_keys), observed=True
+        )["multiplicity"].transform("size")
+        deduplicated["consistent"] = n_error_classes == 1
+
+        return deduplicated
+
+    @classmethod
+    def deduplicate(
+        cls,
+        data_interface: DataInterface,
+        table: pd.DataFrame,
+        equivalence_keys: Sequence[str] = default_equivalence_keys,
+    ) -> DataInterface:
+        """
+        Creates a data interface where equivalent runs are collapsed, see
+        deduplicated_table(). The SeuLog keeps only the representative runs, and runs
+        which are not in the table, and run_multiplicities holds the number of runs
+        each representative stands for.
+
+        Estimators which weight the runs by DataInterface.run_weights give the same
+        error rates on the new data interface as on the full SeuLog, for less work:
+        BaseTools.error_rate_tree(), error_classification_confidence(),
+        remaining_runs(), and the plots of error_classification() and
+        IbexHwsecCoremarkTools.alert_classification(). The collapsed runs were all
+        simulated, so the confidence intervals use the number of runs the rows stand
+        for (see DataInterface.effective_sample_size()), and are the same as on the
+        full SeuLog.
+
+        Anything which counts rows instead is not valid on the new data interface:
+        error_classification() and alert_classification() return one row per
+        representative run, and the windows of BaseTools.windowed_error_rate() are
+        window_size rows, i.e. more runs where runs were collapsed.
+
+        The register tree, the golden log, and the optional data are shared with the
+        original data interface. The new data interface cannot be refreshed (see
+        DataInterface.refresh()), refresh the original and deduplicate it again.
+
+        :param data_interface: Data interface with the SeuLog of the campaign
+        :type data_interface: DataInterface
+        :param table: Runs as returned by injection_table() for the same data interface
+        :type table: pd.DataFrame
+        :param equivalence_keys: Columns of the table which make injections
+        equivalent, defaults to register, encoded cycle, and bit number
+        :type equivalence_keys: Sequence[str], optional
+        :raises ValueError: Raised if the data interface is already deduplicated
+        :return: Data interface with the deduplicated SeuLog
+        :rtype: DataInterface
+        """
+        if data_interface.run_multiplicities is not None:
+            raise ValueError("The data interface is already deduplicated.")
+
+        deduplicated = cls.deduplicated_table(table, equivalence_keys)
+        multiplicities = pd.Series(
+            deduplicated["multiplicity"].to_numpy(),
+            index=deduplicated["representative_run"].to_numpy(),
+        )
+
+        seu_log = data_interface.seu_log
+        collapsed = seu_log.index.isin(table.index) & ~seu_log.index.isin(
+            multiplicities.index
+        )
+
+        deduplicated_interface = copy.copy(data_interface)
+        deduplicated_interface.seu_log = SeuLog(seu_log[~collapsed])
+        deduplicated_interface.seu_log.name = seu_log.name
+        deduplicated_interface.run_multiplicities = multiplicities
+
+        return deduplicated_interface
+
+    @classmethod
+    def redundancy_report(
+        cls,
+        table: pd.DataFrame,
+        equivalence_keys: Sequence[str] = default_equivalence_keys,
+    ) -> pd.Series:
+        """
+        Counts how many runs of a campaign could have been skipped under the
+        injection interval assumption: every run of a consistent equivalence class but
+        one. Inconsistent classes are not counted, since every run was needed to see
+        the inconsistency. The classes are those of equivalence_classes(), of
+        sensitive injections only. The runs of non-sensitive injections could all be
+        skipped, if the injection intervals are trusted, and are counted separately.
+
+        :param table: Runs as returned by injection_table()
+        :type table: pd.DataFrame
+        :param equivalence_keys: Columns of the table which make injections
+        equivalent, defaults to register, encoded cycle, and bit number
+        :type equivalence_keys: Sequence[str], optional
+        :return: Number of runs, equivalence classes, inconsistent classes, runs which
+        could have been skipped, and non-sensitive runs, and the fraction of runs
+        which could have been skipped
+        :rtype: pd.Series
+        """
+        classes = cls.equivalence_classes(table, equivalence_keys)
+        consistent = classes["consistent"]
+        n_redundant = int((classes["n_runs"][consistent] - 1).sum())
+
+        return pd.Series(
+            {
+                "n_runs": len(table),
+                "n_classes": len(classes),
+                "n_inconsistent_classes": int((~consistent).sum()),
+                "n_redundant_runs": n_redundant,
+                "n_non_sensitive_runs": int((~table["is_sensitive"]).sum()),
+                "redundant_fraction": n_redundant / max(len(table), 1),
+            },
+            dtype=object,
+        )
+
+    @classmethod
+    def _to_integers(cls, values: pd.Series) -> pd.arrays.IntegerArray:
+        # SeuLog columns of integers are Int64 already, see SeuLog.from_parsed()
+        if not pd.api.types.is_numeric_dtype(values):
+            values = pd.to_numeric(values.astype(object), errors="coerce")
+
+        return values.astype("Int64").array
@@ -0,0 +1,281 @@
+from typing import Tuple, Union
+
+import matplotlib.pyplot as plt
+import pandas as pd
+import numpy as np
+
+from ..data_interface import DataInterface
+
+
+class MultiInjection:
+    # column of the SeuLog with the bit flipped in the register
+    bit_number_column = "bit_number"
+
+    # largest number of injections drawn and sorted at once
+    chunk_size: int = 2**20
+
+    @classmethod
+    def bit_widths(cls, data_interface: DataInterface) -> pd.Series:
+        """
+        Estimates the number of bits of every register in the register tree. The VPI
+        file (reg_tree.txt) lists the registers, but not their widths, so the width
+        of a register with runs is the highest bit number injected into it plus one.
+        The bits of [DATA][vpi_bits] not accounted for by these registers are spread
+        evenly over the registers without runs, with at least one bit each.
+
+        :param data_interface: Data interface holding the SeuLog and register tree
+        :type data_interface: DataInterface
+        :return: Number of bits of every register (leaf of the register tree),
+        indexed by SoC path
+        :rtype: pd.Series
+        """
+        registers = [
+            node.soc_path for node in data_interface.node_index.preorder if node.is_leaf
+        ]
+        seu_log = data_interface.seu_log
+        bit_numbers = pd.to_numeric(
+            seu_log[cls.bit_number_column].astype(object), errors="coerce"
+        )
+        observed = (
+            bit_numbers.groupby(seu_log["register"].astype(str).to_numpy()).max() + 1
+        )
+        widths = observed.reindex(registers)
+
+        missing = widths.isna()
+        if missing.any():
+            remaining_bits = data_interface.run_info.data.vpi_bits - widths.sum()
+            widths[missing] = max(remaining_bits // missing.sum(), 1)
+
+        return widths.astype(np.int64).rename("bit_width")
+
+    @classmethod
+    def simulate(
+        cls,
+        n_runs: int,
+        n_injection_cycles: int,
+        bit_widths: Union[int, pd.Series],
+        n_trials: int = 1000,
+        per_register: bool = False,
+        seed: int = 0,
+    ) -> pd.Series:
+        """
+        Simulates n_trials campaigns of n_runs runs each, and counts the runs of each
+        campaign which inject the same bit at the same clock cycle as another run of
+        the campaign. This is the number the closed form of
+        BaseTools.expected_num_multi_injection_runs() gives the mean of, and the
+        simulation gives its full distribution.
+
+        Every injection is a cell (register bit, cycle). If per_register is False,
+        the bit is drawn uniformly from all bits, as in the closed form. If it is
+        True, the register is drawn uniformly first, and then a bit of the register,
+        so the bits of narrow registers are hit more often.
+
+        The injections are not drawn one campaign at a time. The cells are split
+        into blocks, the number of injections of every campaign in every block is
+        drawn from a multinomial distribution, and then the injections are drawn
+        within the blocks, at most chunk_size at a time. Runs in different blocks
+        can never collide, so only the injections of one chunk are sorted together,
+        and the memory stays bounded for any number of runs.
+
+        :param n_runs: Number of runs of each campaign
+        :type n_runs: int
+        :param n_injection_cycles: Number of clock cycles injections are made in,
+        e.g. [DATA][cpu_cycles]
+        :type n_injection_cycles: int
+        :param bit_widths: Number of bits of every register (see bit_widths()), or
+        the total number of bits, e.g. [DATA][vpi_bits]
+        :type bit_widths: Union[int, pd.Series]
+        :param n_trials: Number of simulated campaigns, defaults to 1000
+        :type n_trials: int, optional
+        :param per_register: Whether the register is drawn before the bit, defaults
+        to False
+        :type per_register: bool, optional
+        :param seed: Seed of the simulation, defaults to 0
+        :type seed: int, optional
+        :return: Number of runs sharing their injection with another run, for every
+        simulated campaign
+        :rtype: pd.Series
+        """
+        rng = np.random.default_rng(seed)
+        sizes, probabilities = cls._blocks(
+            n_runs, n_injection_cycles, bit_widths, per_register
+        )
+        offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+        n_cells = int(sizes.sum())
+        n_blocks = len(sizes)
+
+        # injections per (campaign, block), campaign by campaign
+        counts = rng.multinomial(n_runs, probabilities, size=n_trials).ravel()
+        ends = np.cumsum(counts)
+
+        collided = np.zeros(n_trials, dtype=np.int64)
+        start = 0
+        while start < len(counts):
+            done = ends[start - 1] if start > 0 else 0
+            end = max(
+                np.searchsorted(ends, done + cls.chunk_size, side="right"), start + 1
+            )
+
+            pairs = np.arange(start, end)
+            n_draws = counts[start:end]
+            blocks = pairs % n_blocks
+            trials = np.repeat(pairs // n_blocks, n_draws)
+            draw_sizes = np.repeat(sizes[blocks], n_draws)
+
+            # uniform cells within the blocks, the minimum guards against rounding up
+            keys = (rng.random(len(trials)) * draw_sizes).astype(np.int64)
+            np.minimum(keys, draw_sizes - 1, out=keys)
+            keys += np.repeat(offsets[blocks], n_draws)
+            # the cells of different campaigns are kept apart by the campaign number
+            keys += trials * n_cells
+            keys.sort()
+
+            same = keys[1:] == keys[:-1]
+            shared = np.zeros(len(keys), dtype=bool)
+            shared[1:] |= same
+            shared[:-1] |= same
+            collided += np.bincount(keys[shared] // n_cells, minlength=n_trials)
+
+            start = end
+
+        return pd.Series(collided, name="multi_injection_runs")
+
+    @classmethod
+    def expected_runs(
+        cls,
+        n_runs: int,
+        n_injection_cycles: int,
+        bit_widths: Union[int, pd.Series],
+        per_register: bool = False,
+    ) -> float:
+        """
+        The closed form of the mean of simulate(), the expected number of runs which
+        share their injection with another run. A run in a cell hit with probability
+        p collides with probability 1 - (1 - p)^(n_runs - 1). If the bits are drawn
+        uniformly, this is BaseTools.expected_num_multi_injection_runs().
+
+        :param n_runs: Number of runs of the campaign
+        :type n_runs: int
+        :param n_injection_cycles: Number of clock cycles injections are made in
+        :type n_injection_cycles: int
+        :param bit_widths: Number of bits of every register, or the total number of
+        bits
+        :type bit_widths: Union[int, pd.Series]
+        :param per_register: Whether the register is drawn before the bit, defaults
+        to False
+        :type per_register: bool, optional
+        :return: Expected number of runs sharing their injection with another run
+        :rtype: float
+        """
+        widths = np.atleast_1d(np.asarray(bit_widths, dtype=float))
+        if per_register:
+            register_probabilities = np.full(len(widths), 1 / len(widths))
+        else:
+            register_probabilities = widths / widths.sum()
+        cell_probabilities = register_probabilities / (widths * n_injection_cycles)
+
+        return float(
+            n_runs
+            * np.sum(
+                register_probabilities
+                * -np.expm1((n_runs - 1) * np.log1p(-cell_probabilities))
+            )
+        )
+
+    @classmethod
+    def simulate_campaign(
+        cls,
+        data_interface: DataInterface,
+        n_runs: int,
+        n_trials: int = 1000,
+        per_register: bool = False,
+        seed: int = 0,
+        visualize: bool = False,
+    ) -> Union[pd.Series, Tuple[pd.Series, plt.Figure]]:
+        """
+        Runs simulate() with the injection space of a campaign: [DATA][cpu_cycles]
+        clock cycles, and the bit widths of the registers (see bit_widths()) if
+        per_register is True, or [DATA][vpi_bits] bits otherwise.
+
+        :param data_interface: Data interface of the campaign
+        :type data_interface: DataInterface
+        :param n_runs: Number of runs of each simulated campaign
+        :type n_runs: int
+        :param n_trials: Number of simulated campaigns, defaults to 1000
+        :type n_trials: int, optional
+        :param per_register: Whether the register is drawn before the bit, defaults
+        to False
+        :type per_register: bool, optional
+        :param seed: Seed of the simulation, defaults to 0
+        :type seed: int, optional
+        :param visualize: Whether to plot the distribution against the closed form,
+        defaults to False
+        :type visualize: bool, optional
+        :return: Number of runs sharing their injection with another run, for every
+        simulated campaign
+        :rtype: Union[pd.Series, Tuple[pd.Series, plt.Figure]]
+        """
+        data = data_interface.run_info.data
+        if per_register:
+            bit_widths = cls.bit_widths(data_interface)
+        else:
+            bit_widths = data.vpi_bits
+
+        collided = cls.simulate(
+            n_runs, data.cpu_cycles, bit_widths, n_trials, per_register, seed
+        )
+
+        if not visualize:
+            return collided
+
+        expected = cls.expected_runs(n_runs, data.cpu_cycles, bit_widths, per_register)
+        fig, ax = plt.subplots()
+        counts = collided.value_counts(normalize=True).sort_index()
+        ax.bar(counts.index, counts.to_numpy(), width=1, label="Simulated")
+        ax.axvline(expected, color="black", linestyle="--", label="Closed form mean")
+        ax.set_xlabel(r"$\Lambda$")
+        ax.set_ylabel("Fraction of campaigns")
+        ax.set_title(r"$\Lambda$= number of resamples")
+        fig.suptitle(f"Distribution of re-samples given {n_runs:,} runs")
+        ax.legend()
+        ax.grid()
+
+        return collided, fig
+
+    @classmethod
+    def _blocks(
+        cls,
+        n_runs: int,
+        n_injection_cycles: int,
+        bit_widths: Union[int, pd.Series],
+        per_register: bool,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Splits the cells into blocks with a uniform probability within each block,
+        one per register, and splits blocks expected to get more than chunk_size
+        injections into equal parts.
+
+        :return: Number of cells of every block, and the probability of an injection
+        to be in the block
+        :rtype: Tuple[np.ndarray, np.ndarray]
+        """
+        widths = np.atleast_1d(np.asarray(bit_widths, dtype=np.int64))
+        sizes = widths * n_injection_cycles
+        if per_register:
+            probabilities = np.full(len(widths), 1 / len(widths))
+        else:
+            probabilities = sizes / sizes.sum()
+
+        n_parts = np.ceil(n_runs * probabilities / cls.chunk_size).astype(np.int64)
+        n_parts = np.clip(n_parts, 1, sizes)
+        parts = np.repeat(np.arange(len(sizes)), n_parts)
+        # the first parts of a block get one cell more if it does not split evenly
+        part_numbers = np.arange(len(parts)) - np.repeat(
+            np.cumsum(n_parts) - n_parts, n_parts
+        )
+        part_sizes = sizes[parts] // n_parts[parts] + (
+            part_numbers < sizes[parts] % n_parts[parts]
+        )
+        part_probabilities = probabilities[parts] * part_sizes / sizes[parts]
+
+        return part_sizes, part_probabilities / part_probabilities.sum()
@@ -0,0 +1,133 @@
+from typing import Dict, List, Tuple, Union
+
+from anytree import PreOrderIter
+import numpy as np
+
+from .node import Node
+
+
+class NodeIndex:
+    by_path: Dict[str, Node] = None
+    by_name: Dict[str, Tuple[Node, ...]] = None
+    preorder: Tuple[Node, ...] = None
+    positions: Dict[Node, int] = None
+    parent_positions: np.ndarray = None
+    depths: np.ndarray = None
+
+    def __init__(self, root: Node, by_path: Dict[str, Node] = None) -> None:
+        """
+        Hash indexes over the nodes of a register tree, built in one pre-order pass.
+
+        by_path maps the exact SoC path of each node to the node, and by_name maps
+        each name to all nodes with that name, in pre-order. preorder holds every node
+        in pre-order, and positions, parent_positions and depths describe the tree as
+        arrays over that order, see sum_subtrees(). Path prefixes are looked
+        up in a character trie, where every trie node stores the node with the
+        smallest depth among all nodes whose path goes through it. Ties are broken by
+        pre-order, which is the order anytree's findall returns nodes in.
+
+        :param root: Root of the register tree
+        :type root: Node
+        :param by_path: Nodes by SoC path, if these are already known from building
+        the tree, defaults to None
+        :type by_path: Dict[str, Node], optional
+        """
+        build_by_path = by_path is None
+        self.by_path = dict() if build_by_path else by_path
+
+        by_name: Dict[str, List[Node]] = dict()
+        preorder: List[Node] = list()
+        self.positions = dict()
+        parent_positions: List[int] = list()
+        self._trie = dict()
+        # trie node at the end of the path of each tree node, and the node depths
+        trie_ends: Dict[Node, dict] = dict()
+        depths: Dict[Node, int] = dict()
+
+        for node in PreOrderIter(root):
+            depth = 0 if node.parent is None else depths[node.parent] + 1
+            depths[node] = depth
+
+            self.positions[node] = len(preorder)
+            preorder.append(node)
+            parent_positions.append(
+                -1 if node.parent is None else self.positions[node.parent]
+            )
+
+            if build_by_path:
+                self.by_path.setdefault(node.soc_path, node)
+            by_name.setdefault(node.name, list()).append(node)
+
+            # every prefix of the parent path already stores a node at most as deep
+            # as the parent, so only the characters after the parent path are visited
+            if node.parent is None or not node.soc_path.startswith(
+                node.parent.soc_path
+            ):
+                trie_node, suffix = self._trie, node.soc_path
+            else:
+                trie_node = trie_ends[node.parent]
+                suffix = node.soc_path[len(node.parent.soc_path) :]
+
+            self._update_best(trie_node, node, depth)
+            for char in suffix:
+                trie_node = trie_node.setdefault(char, dict())
+                self._update_best(trie_node, node, depth)
+            trie_ends[node] = trie_node
+
+        self.by_name = {name: tuple(nodes) for name, nodes in by_name.items()}
+        self.preorder = tuple(preorder)
+        self.parent_positions = np.array(parent_positions, dtype=np.int64)
+        self.depths = np.array([depths[node] for node in preorder], dtype=np.int64)
+
+        # positions of the nodes at each depth, from the deepest level up to depth 1
+        order = np.argsort(-self.depths, kind="stable")
+        boundaries = np.flatnonzero(np.diff(self.depths[order])) + 1
+        self._levels = [
+            level for level in np.split(order, boundaries) if self.depths[level[0]] > 0
+        ]
+
+    def get_by_prefix(self, prefix: str) -> Union[Node, None]:
+        """
+        Finds the node with the smallest depth among all nodes whose SoC path starts
+        with the prefix.
+
+        :param prefix: Start of the SoC path to search by
+        :type prefix: str
+        :return: Node found by the search. If no Node is found returns None
+        :rtype: Union[Node, None]
+        """
+        trie_node = self._trie
+        for char in prefix:
+            trie_node = trie_node.get(char)
+            if trie_node is None:
+                return None
+
+        return trie_node[""][1]
+
+    def sum_subtrees(self, values: np.ndarray) -> np.ndarray:
+        """
+        Sums values over the subtree of every node, i.e. over the node itself and all
+        of its descendants. The sums are built bottom-up, one level of the tree at a
+        time. The nodes of each level are found once, when the index is built, so
+        every node is added to its parent exactly once, and the cost is linear in the
+        number of nodes.
+
+        :param values: Values of each node alone, with one row per node in the order of
+        preorder. Any number of columns is summed at once.
+        :type values: np.ndarray
+        :return: Sums over the subtree of each node, in the same shape and order
+        :rtype: np.ndarray
+        """
+        sums = np.array(values, copy=True)
+
+        for level in self._levels:
+            np.add.at(sums, self.parent_positions[level], sums[level])
+
+        return sums
+
+    @staticmethod
+    def _update_best(trie_node: dict, node: Node, depth: int) -> None:
+        # the empty string is never a character, so it is free to hold the best node
+        best = trie_node.get("")
+        if best is None or depth < best[0]:
+            trie_node[""] = (depth, node)
@@ -1,9 +1,15 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict
+from typing import Callable, List, Dict, Tuple
+import os
 
 from ....run_info.run_info import RunInfo
 from ..node import Node
 
+# called with the bytes of a log, and the start and end of a line containing the match
+# pattern of the handler. Returns a record (None if there is nothing to record), and
+# the position in the log to continue searching from.
+LineHandler = Callable[[bytes, int, int], Tuple[object, int]]
+
 
 class BaseOptionalData(ABC):
     run_info: RunInfo = None
@@ -17,3 +23,87 @@ class BaseOptionalData(ABC):
 
     def get_data_by_runs(self, runs: List[str]) -> Dict[str, object]:
         return {run: self.get_data_by_run(run) for run in runs}
+
+    def get_line_handlers(self) -> Dict[str, LineHandler]:
+        """
+        Override this to read the optional data in the same pass over the logs as the
+        SEU metadata, instead of reading every log again. Maps a match pattern to the
+        handler of the lines containing the pattern (see LineHandler).
+
+        :return: Line handler of each match pattern. Empty if the subclass reads its
+        data in a separate pass, through _read_optional_log().
+        :rtype: Dict[str, LineHandler]
+        """
+        return dict()
+
+    def read_records(self, text: bytes) -> list:
+        """
+        Runs the line handlers over the bytes of a log, in the order of the lines. Each
+        line is handled at most once, by the handler of the first pattern in it, and
+        lines before the position a handler returns are not handled again. The log is
+        not decoded (see DataParser._read_single_seu_log()), so the handlers decode
+        what they capture themselves.
+
+        This is called by the parser on every SEU log it reads, possibly in a worker
+        process, so it must not modify the object. The records are passed to
+        add_records() in the main process.
+
+        :param text: Full log, as bytes
+        :type text: bytes
+        :return: Records returned by the handlers, in the order of the lines
+        :rtype: list
+        """
+        handlers = self.get_line_handlers()
+
+        matches = list()
+        for pattern, handler in handlers.items():
+            pattern = pattern.encode("utf-8")
+            pos = text.find(pattern)
+            while pos != -1:
+                matches.append((pos, handler))
+                pos = text.find(pattern, pos + len(pattern))
+        matches.sort(key=lambda match: match[0])
+
+        records = list()
+        resume = 0
+        for pos, handler in matches:
+            line_start = text.rfind(b"\n", 0, pos) + 1
+            if line_start < resume:
+                continue
+
+            line_end = text.find(b"\n", pos)
+            if line_end == -1:
+                line_end = len(text)
+
+            record, resume = handler(text, line_start, line_end)
+            resume = max(resume, line_end + 1)
+            if record is not None:
+                records.append(record)
+
+        return records
+
+    def add_records(self, run: str, records: list) -> None:
+        """
+        Stores the records read from the log of a run by read_records(). Subclasses
+        with line handlers must override this.
+
+        :param run: Name of the run
+        :type run: str
+        :param records: Records of the run, in the order of the lines
+        :type records: list
+        """
+        pass
+
+    def _read_optional_log(self, run_path: str) -> None:
+        """
+        Reads the optional data of a single run, in a pass of its own. Used when the
+        logs are not parsed, e.g. when they are loaded from the cache.
+
+        :param run_path: Path to the SEU log of the run
+        :type run_path: str
+        """
+        with open(run_path, "rb") as f:
+            text = f.read()
+
+        run = os.path.basename(os.path.dirname(run_path))
+        self.add_records(run, self.read_records(text))
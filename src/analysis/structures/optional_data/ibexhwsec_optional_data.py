@@ -1,9 +1,10 @@
-from typing import Dict, Tuple
+from typing import Dict, List, Tuple
 import re
 
 import pandas as pd
+import numpy as np
 
-from .base_optional_data import BaseOptionalData, RunInfo
+from .base_optional_data import BaseOptionalData, LineHandler, RunInfo
 
 
 class IbexHwsecOptionalData(BaseOptionalData):
@@ -12,58 +13,137 @@ class IbexHwsecOptionalData(BaseOptionalData):
     alert_val_match_string = "Alert signal raised: "
     alert_cyc_match_string = "Alert cycle: "
 
-    optional_datas: Dict[str, pd.DataFrame] = dict()
+    # columns of get_alert_summary()
+    any_alert_name = "Alert"
+    first_alert_cyc_name = "First alert cycle"
+    alert_count_name = "Alert count"
 
     def __init__(self, run_info: RunInfo) -> None:
-        super().__init__(run_info)
+        """
+        Alerts raised in the runs of the Ibex hardware security setup.
 
-    def _read_optional_log(self, run_path: str) -> None:
-        try:
-            with open(run_path, "r") as f:
-                log_lines = f.readlines()
-        except UnicodeDecodeError as e:
-            return None
+        All alerts are kept in one long-format table, see alerts. Alerts added by
+        add_records() are collected in lists, and only moved to the table when it is
+        used, so the table is not rebuilt for every run.
 
-        result = dict()
-        register: str = None
-        reg = self.run_info.seu_metadata.register
+        :param run_info: Configuration object
+        :type run_info: RunInfo
+        """
+        super().__init__(run_info)
+        self._alerts = self._alert_table(list(), list(), list())
+        self._new_alerts: List[Tuple[str, int, int]] = list()
 
-        matched = False
-        not_found_reg = True
-        for i, line in enumerate(log_lines):
-            # This loop assumes that the alert val will always come before the cycle
-            if matched:
-                matched = False
-                continue
+    @property
+    def alerts(self) -> pd.DataFrame:
+        """
+        Every alert raised in the runs, one row per alert, indexed by run, with the
+        alert value and the alert cycle as columns. Runs with no alerts have no rows.
 
-            if not_found_reg:
-                if reg in line:
-                    not_found_reg = False
-                    register = line.split(reg)[1].strip(" \n\t[]0123456789")
+        :return: The alerts of all runs
+        :rtype: pd.DataFrame
+        """
+        if len(self._new_alerts) > 0:
+            runs, values, cycles = zip(*self._new_alerts)
+            self._alerts = pd.concat(
+                [self._alerts, self._alert_table(runs, values, cycles)]
+            )
+            self._new_alerts = list()
 
-            if not (self.alert_val_match_string in line):
-                continue
+        return self._alerts
 
-            matched = True
+    def get_line_handlers(self) -> Dict[str, LineHandler]:
+        return {self.alert_val_match_string: self._handle_alert}
 
-            res = self.__parse_cycles((line, log_lines[i + 1]))
-            result[len(result)] = res
+    def add_records(self, run: str, records: List[Tuple[int, int]]) -> None:
+        self._new_alerts += [(run, value, cycle) for value, cycle in records]
 
-        if register is None or len(result) == 0:
+    def get_data_by_run(self, run: str) -> pd.DataFrame:
+        """
+        :param run: Name of the run
+        :type run: str
+        :return: The alerts of the run, or None if the run raised no alerts
+        :rtype: pd.DataFrame
+        """
+        alerts = self.alerts
+        if run not in alerts.index:
             return None
 
-        self.optional_datas[run_path.split("/")[-2]] = pd.DataFrame.from_dict(
-            result, orient="index"
+        return alerts.loc[[run]].reset_index(drop=True)
+
+    def get_data_by_runs(self, runs: List[str]) -> Dict[str, pd.DataFrame]:
+        alerts = self.alerts
+        selected = alerts[alerts.index.isin(runs)]
+        by_run = {
+            run: run_alerts.reset_index(drop=True)
+            for run, run_alerts in selected.groupby(level=0, sort=False)
+        }
+
+        return {run: by_run.get(run) for run in runs}
+
+    def get_alert_summary(self, runs: List[str] = None) -> pd.DataFrame:
+        """
+        Summarizes the alerts of each run: whether any alert was raised, the cycle of
+        the first alert, and the number of alerts.
+
+        :param runs: Runs to summarize, in the order of the rows. If None, all runs
+        with at least one alert are summarized, defaults to None
+        :type runs: List[str], optional
+        :return: One row per run. Runs with no alerts have no first alert cycle
+        (pd.NA), and an alert count of 0.
+        :rtype: pd.DataFrame
+        """
+        alerts = self.alerts
+        if runs is not None:
+            alerts = alerts[alerts.index.isin(runs)]
+
+        cycles = alerts[self.alert_cyc_name].groupby(level=0, sort=False)
+        summary = pd.DataFrame(
+            {
+                self.first_alert_cyc_name: cycles.min().astype("Int64"),
+                self.alert_count_name: cycles.size(),
+            }
         )
 
-    def get_data_by_run(self, run: str) -> pd.DataFrame:
-        try:
-            return self.optional_datas[run]
-        except KeyError:
-            return None
+        if runs is not None:
+            summary = summary.reindex(runs)
+            summary[self.alert_count_name] = (
+                summary[self.alert_count_name].fillna(0).astype(np.int64)
+            )
+        summary.insert(0, self.any_alert_name, summary[self.alert_count_name] > 0)
+        summary.index.name = "run"
+
+        return summary
+
+    def _handle_alert(
+        self, text: bytes, line_start: int, line_end: int
+    ) -> Tuple[Tuple[int, int], int]:
+        # this assumes that the alert cycle is always on the line after the alert val
+        if line_end >= len(text):
+            return None, line_end
+
+        next_line_end = text.find(b"\n", line_end + 1)
+        if next_line_end == -1:
+            next_line_end = len(text)
+
+        res = self.__parse_cycles(
+            (text[line_start:line_end], text[line_end + 1 : next_line_end])
+        )
+
+        return res, next_line_end + 1
+
+    def _alert_table(
+        self, runs: List[str], values: List[int], cycles: List[int]
+    ) -> pd.DataFrame:
+        return pd.DataFrame(
+            {
+                self.alert_val_name: np.array(values, dtype=np.int64),
+                self.alert_cyc_name: np.array(cycles, dtype=np.int64),
+            },
+            index=pd.Index(runs, dtype=object, name="run"),
+        )
 
-    def __parse_cycles(self, lines: Tuple[str, str]) -> Dict[str, int]:
-        val = list(map(int, re.findall(r"\d+", lines[0])))[0]
-        cyc = list(map(int, re.findall(r"\d+", lines[1])))[0]
+    def __parse_cycles(self, lines: Tuple[bytes, bytes]) -> Tuple[int, int]:
+        val = list(map(int, re.findall(rb"\d+", lines[0])))[0]
+        cyc = list(map(int, re.findall(rb"\d+", lines[1])))[0]
 
-        return {self.alert_val_name: val, self.alert_cyc_name: cyc}
+        return val, cyc
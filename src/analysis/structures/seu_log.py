@@ -1,9 +1,25 @@
+from __future__ import annotations
+from typing import Dict, List
+
 import pandas as pd
+import numpy as np
+from pandas.api.types import union_categoricals
+
+from ...run_info.run_info import RunInfo
 
 
 class SeuLog(pd.DataFrame):
     name: str = ""
 
+    # SEU_METADATA entries stored as Int64 or Float64, all other columns are
+    # categorical strings
+    integer_columns: List[str] = ["vpi_bits", "bit_number", "uvm_seed"]
+    float_columns: List[str] = ["injection_cycle"]
+
+    # ANSI escape sequences, or stray escape characters, left in the logs by the
+    # simulator output, e.g. the colour reset after the UVM seed
+    escape_pattern: str = r"\x1b(?:\[[0-?]*[ -/]*[@-~])?"
+
     def __init__(self, *args, **kwargs) -> None:
         """
         Wrapper class for the pandas dataframe. This is just to add the attribute name
@@ -12,3 +28,251 @@ class SeuLog(pd.DataFrame):
         All SEU log dataframes should be wrapped in this class.
         """
         super().__init__(*args, **kwargs)
+
+    @classmethod
+    def from_parsed(cls, data: pd.DataFrame, run_info: RunInfo) -> SeuLog:
+        """
+        Wraps parsed SEU logs, and converts every column from strings to a compact
+        dtype, once, so the rest of the code does not have to. The dtype of a column
+        depends only on its name, never on its values, so every batch of runs (see
+        SeuLogBuilder) and every refresh gets the same schema:
+
+        - The SEU_METADATA entries in cls.integer_columns (VPI bits, bit numbers,
+          seeds) become nullable Int64. Values which are not integers become pd.NA.
+        - The entries in cls.float_columns (injection cycles, which are simulation
+          times in some testbenches and can have decimals) become nullable Float64.
+          Values which are not numbers become pd.NA.
+        - Every other column stays strings, in a categorical: the register, the
+          COMPARISON_DATA entries (the CRCs), and metadata such as register values,
+          which are hex strings whose leading zeros matter.
+
+        Escape sequences are stripped from all values first, see strip_escapes().
+        Missing values stay missing (NaN in categoricals, pd.NA in numeric columns).
+        Columns which already have the dtype of the schema are left as they are, so
+        this can also be used on logs which were converted before, e.g. after
+        concatenating.
+
+        :param data: Parsed SEU logs, one row per run and one column per entry
+        :type data: pd.DataFrame
+        :param run_info: Configuration object
+        :type run_info: RunInfo
+        :return: The SEU logs with converted columns
+        :rtype: SeuLog
+        """
+        columns = dict()
+        for column in data.columns:
+            values = data[column]
+            dtype = cls.column_dtype(column)
+
+            if isinstance(values.dtype, type(dtype)):
+                columns[column] = values
+                continue
+
+            values = cls.strip_escapes(values)
+            if isinstance(dtype, pd.Int64Dtype):
+                columns[column] = cls._to_integers(values)
+            elif isinstance(dtype, pd.Float64Dtype):
+                columns[column] = cls._to_floats(values)
+            else:
+                columns[column] = values.astype("category")
+
+        return cls(columns, index=data.index)
+
+    @classmethod
+    def concat(cls, seu_logs: List[SeuLog]) -> SeuLog:
+        """
+        Joins SeuLogs with the schema of from_parsed(), row-wise and column by column.
+        The numeric columns are concatenated, and the categoricals are joined with their
+        categories sorted as in from_parsed(), so no value is converted, and the
+        result has the same schema. pd.concat() would turn categoricals with different
+        categories into strings.
+
+        :param seu_logs: SeuLogs with the same columns
+        :type seu_logs: List[SeuLog]
+        :return: All rows of the SeuLogs, in order
+        :rtype: SeuLog
+        """
+        index = seu_logs[0].index.append([seu_log.index for seu_log in seu_logs[1:]])
+
+        columns = dict()
+        for column in seu_logs[0].columns:
+            parts = [seu_log[column] for seu_log in seu_logs]
+
+            if not isinstance(cls.column_dtype(column), pd.CategoricalDtype):
+                columns[column] = pd.concat(parts, ignore_index=True).array
+            else:
+                columns[column] = union_categoricals(
+                    [part.array for part in parts], sort_categories=True
+                )
+
+        return cls(columns, index=index)
+
+    @classmethod
+    def column_dtype(cls, column: str) -> pd.api.extensions.ExtensionDtype:
+        """
+        :param column: Name of a column of the SeuLog
+        :type column: str
+        :return: The dtype of the column in the schema of from_parsed()
+        :rtype: pd.api.extensions.ExtensionDtype
+        """
+        if column in cls.integer_columns:
+            return pd.Int64Dtype()
+        if column in cls.float_columns:
+            return pd.Float64Dtype()
+
+        return pd.CategoricalDtype()
+
+    @classmethod
+    def strip_escapes(cls, values: pd.Series) -> pd.Series:
+        """
+        Removes escape sequences from strings, and strips whitespace left around them.
+        Used on both the SEU logs and the golden log, so they are compared equally.
+
+        :param values: Strings to clean. Missing values are kept as they are.
+        :type values: pd.Series
+        :return: The cleaned strings
+        :rtype: pd.Series
+        """
+        if pd.api.types.infer_dtype(values, skipna=True) != "string":
+            return values
+
+        # searching all values joined together is much faster than one search each
+        if "\x1b" not in "".join(values[values.notna()]):
+            return values
+
+        values = values.str.replace(cls.escape_pattern, "", regex=True).str.strip()
+
+        return values
+
+    @classmethod
+    def _to_integers(cls, values: pd.Series) -> pd.Series:
+        """
+        Converts strings to nullable integers. Values which are not integers, or too
+        large for an int64, become pd.NA.
+
+        :param values: Strings to convert
+        :type values: pd.Series
+        :return: The values as Int64
+        :rtype: pd.Series
+        """
+        numbers = pd.to_numeric(values.astype(object), errors="coerce")
+        is_integer = numbers.notna() & (numbers % 1 == 0) & (numbers.abs() < 2**63)
+
+        return numbers.where(is_integer).astype("Int64")
+
+    @classmethod
+    def _to_floats(cls, values: pd.Series) -> pd.Series:
+        """
+        Converts strings to nullable floats. Values which are not numbers become
+        pd.NA.
+
+        :param values: Strings to convert
+        :type values: pd.Series
+        :return: The values as Float64
+        :rtype: pd.Series
+        """
+        numbers = pd.to_numeric(values.astype(object), errors="coerce")
+
+        return numbers.astype(float).astype("Float64")
+
+
+class SeuLogBuilder:
+    # number of runs collected as strings before they are converted to a SeuLog
+    flush_size: int = 4096
+
+    def __init__(
+        self, run_info: RunInfo, columns: List[str], flush_size: int = None
+    ) -> None:
+        """
+        Builds a SeuLog column by column while logs are parsed, without keeping a
+        dictionary per run and transposing at the end.
+
+        The parsed strings of each column are appended to a list. Every flush_size
+        runs these lists are converted to a typed SeuLog batch (see
+        SeuLog.from_parsed()) and dropped, so only a small number of runs is ever held
+        as Python strings, and the peak memory follows the size of the typed columns.
+        build() joins the batches column by column.
+
+        :param run_info: Configuration object
+        :type run_info: RunInfo
+        :param columns: Names of the columns, in order
+        :type columns: List[str]
+        :param flush_size: Number of runs per batch. Uses cls.flush_size if None,
+        defaults to None
+        :type flush_size: int, optional
+        """
+        self.run_info = run_info
+        self.columns = list(columns)
+        self.flush_size = self.flush_size if flush_size is None else flush_size
+
+        self._runs: List[str] = list()
+        self._values: Dict[str, list] = {column: list() for column in self.columns}
+        self._batches: List[SeuLog] = list()
+        self._n_runs = 0
+
+    def __len__(self) -> int:
+        return self._n_runs
+
+    def append(self, run: str, values: Dict[str, str]) -> None:
+        """
+        Adds a single parsed run.
+
+        :param run: Name of the run
+        :type run: str
+        :param values: Parsed value of each column. Missing columns are set to NaN.
+        :type values: Dict[str, str]
+        """
+        self._runs.append(run)
+        for column in self.columns:
+            self._values[column].append(values.get(column, np.nan))
+
+        self._n_runs += 1
+        if len(self._runs) >= self.flush_size:
+            self.flush()
+
+    def extend(self, runs: List[str], values: Dict[str, list]) -> None:
+        """
+        Adds a number of parsed runs, given column by column.
+
+        :param runs: Names of the runs
+        :type runs: List[str]
+        :param values: Parsed values of each column, in the same order as the runs
+        :type values: Dict[str, list]
+        """
+        self._runs += runs
+        for column in self.columns:
+            self._values[column] += values[column]
+
+        self._n_runs += len(runs)
+        if len(self._runs) >= self.flush_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Converts the runs added since the last flush to a typed SeuLog batch.
+        """
+        if len(self._runs) == 0:
+            return
+
+        batch = pd.DataFrame(self._values, index=self._runs, dtype=object)
+        self._batches.append(SeuLog.from_parsed(batch, self.run_info))
+
+        self._runs = list()
+        self._values = {column: list() for column in self.columns}
+
+    def build(self) -> SeuLog:
+        """
+        Joins all runs added to the builder into one SeuLog, in the order they were
+        added (see SeuLog.concat()). The result is the same as converting all runs at
+        once.
+
+        :return: The SeuLog of all added runs
+        :rtype: SeuLog
+        """
+        self.flush()
+
+        if len(self._batches) == 0:
+            empty = pd.DataFrame({column: [] for column in self.columns}, dtype=object)
+            return SeuLog.from_parsed(empty, self.run_info)
+
+        return SeuLog.concat(self._batches)
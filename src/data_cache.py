@@ -0,0 +1,179 @@
+"""
+On-disk cache of the parsed logs, stored in Feather files next to the data.
+"""
+from typing import List, Tuple, Union
+import hashlib
+import os
+
+import pandas as pd
+
+from .run_info.run_info import RunInfo
+from .colorprint import ColorPrinter as cp
+
+
+class DataCache:
+    # bump this if the format of the cached files, or the parsed values, change
+    version: int = 5
+    directory_name: str = ".pulse_cache"
+
+    @classmethod
+    def fingerprint(cls, run_info: RunInfo) -> str:
+        """
+        Computes a fingerprint of the data-directory, from the path, size and
+        modification time of the SEU log in every run. Any run being added, removed,
+        or rewritten changes the fingerprint.
+
+        :param run_info: Configuration object
+        :type run_info: RunInfo
+        :return: Hex digest of the fingerprint
+        :rtype: str
+        """
+        data_dir = os.path.join(os.getcwd(), run_info.data.directory)
+        digest = hashlib.sha256()
+
+        for run in sorted(os.listdir(data_dir)):
+            try:
+                stat = os.stat(os.path.join(data_dir, run, run_info.data.seu))
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+
+            digest.update(f"{run}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode())
+
+        golden = os.stat(os.path.join(data_dir, run_info.data.golden))
+        digest.update(f"{golden.st_size}\0{golden.st_mtime_ns}".encode())
+
+        return digest.hexdigest()
+
+    @classmethod
+    def load(
+        cls, run_info: RunInfo, fingerprint: str
+    ) -> Union[Tuple[pd.DataFrame, pd.Series, List[str]], None]:
+        """
+        Loads the parsed logs from the cache, if the cache was written with the same
+        parsing configuration and the same fingerprint of the data-directory.
+
+        :param run_info: Configuration object
+        :type run_info: RunInfo
+        :param fingerprint: Fingerprint of the data-directory, see cls.fingerprint()
+        :type fingerprint: str
+        :return: The SEU logs, the golden log, and the runs with no registers. None if
+        there is no valid cache.
+        :rtype: Union[Tuple[pd.DataFrame, pd.Series, List[str]], None]
+        """
+        cache_dir = cls._cache_dir(run_info)
+
+        try:
+            with open(os.path.join(cache_dir, "fingerprint.txt"), "r") as f:
+                if f.read().strip() != fingerprint:
+                    return None
+
+            seu_log = pd.read_feather(os.path.join(cache_dir, "seu_log.feather"))
+            golden_log = pd.read_feather(os.path.join(cache_dir, "golden_log.feather"))
+            non_register_runs = pd.read_feather(
+                os.path.join(cache_dir, "non_register_runs.feather")
+            )
+        except FileNotFoundError:
+            return None
+
+        seu_log = seu_log.set_index("run").rename_axis(None)
+        golden_log = golden_log.set_index("entry")["value"].rename_axis(None)
+        golden_log.name = None
+
+        if cls._print_debug(run_info):
+            cp.print_header(f"Loaded {len(seu_log)} parsed SEU logs from cache")
+
+        return seu_log, golden_log, list(non_register_runs["run"])
+
+    @classmethod
+    def save(
+        cls,
+        run_info: RunInfo,
+        fingerprint: str,
+        seu_log: pd.DataFrame,
+        golden_log: pd.Series,
+        non_register_runs: List[str],
+    ) -> None:
+        """
+        Writes the parsed logs to the cache. The fingerprint is written last, so a
+        cache which was only partially written is never loaded.
+
+        :param run_info: Configuration object
+        :type run_info: RunInfo
+        :param fingerprint: Fingerprint of the data-directory taken before parsing, see
+        cls.fingerprint()
+        :type fingerprint: str
+        :param seu_log: Parsed SEU logs
+        :type seu_log: pd.DataFrame
+        :param golden_log: Parsed golden log
+        :type golden_log: pd.Series
+        :param non_register_runs: Runs where no register was parsed
+        :type non_register_runs: List[str]
+        """
+        cache_dir = cls._cache_dir(run_info)
+        os.makedirs(cache_dir, exist_ok=True)
+
+        fingerprint_path = os.path.join(cache_dir, "fingerprint.txt")
+        if os.path.exists(fingerprint_path):
+            os.remove(fingerprint_path)
+
+        pd.DataFrame(seu_log).rename_axis("run").reset_index().to_feather(
+            os.path.join(cache_dir, "seu_log.feather")
+        )
+        pd.DataFrame(
+            {"entry": golden_log.index, "value": golden_log.values}
+        ).to_feather(os.path.join(cache_dir, "golden_log.feather"))
+        pd.DataFrame({"run": pd.Series(non_register_runs, dtype=object)}).to_feather(
+            os.path.join(cache_dir, "non_register_runs.feather")
+        )
+
+        with open(fingerprint_path, "w") as f:
+            f.write(fingerprint)
+
+    @classmethod
+    def _cache_dir(cls, run_info: RunInfo) -> str:
+        """
+        The cache lives in the data-directory, in a sub-directory named by a hash of
+        the parts of the config file which decide what is parsed. Changing a match
+        pattern, the sample of runs, or the parts of the logs which are read, therefore
+        never loads logs parsed with the old configuration.
+
+        :param run_info: Configuration object
+        :type run_info: RunInfo
+        :return: Path to the cache directory for this configuration
+        :rtype: str
+        """
+        digest = hashlib.sha256()
+        digest.update(f"{cls.version}\0{run_info.data.seu}\0".encode())
+        digest.update(f"{run_info.data.golden}\n".encode())
+        if run_info.data.sample_size != -1:
+            digest.update(
+                f"{run_info.data.sample_size}\0{run_info.data.sample_seed}\n".encode()
+            )
+        if run_info.data.reads_partially:
+            digest.update(
+                f"{run_info.data.read_head_kb}\0{run_info.data.read_tail_kb}\n".encode()
+            )
+
+        for section in [run_info.seu_metadata, run_info.comparison_data]:
+            for info in section.entries:
+                digest.update(f"{info}\0{getattr(section, info)}\n".encode())
+            digest.update(b"\0\n")
+
+        return os.path.join(
+            os.getcwd(),
+            run_info.data.directory,
+            cls.directory_name,
+            digest.hexdigest()[:16],
+        )
+
+    @classmethod
+    def _print_debug(cls, run_info: RunInfo) -> bool:
+        print_debug = False
+        for option in [
+            run_info.debug.percent_failed_reads,
+            run_info.debug.error_utf_parsing,
+            run_info.debug.loading_bar_on_data_parsing,
+        ]:
+            print_debug = print_debug or option
+
+        return print_debug
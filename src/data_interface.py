@@ -1,15 +1,22 @@
-from typing import List, Tuple, Union
+from typing import Callable, Dict, List, Tuple, Union
 import os
 
-from anytree import findall as findall_nodes
 import pandas as pd
+import numpy as np
 
 from .run_info.run_info import RunInfo
 from .data_parser import DataParser
+from .data_cache import DataCache
 from .colorprint import ColorPrinter as cp
 
 from .analysis.structures.seu_log import SeuLog
 from .analysis.structures.node import Node
+from .analysis.structures.node_index import NodeIndex
+from .analysis.structures.error_definitions import (
+    SilentError,
+    DataCorruptionError,
+    CriticalError,
+)
 
 # if you want to import optional data of some sort you need to change the import here
 # and also create your own custom class in the structures fodler
@@ -23,15 +30,30 @@ from .analysis.structures.optional_data.ibexhwsec_optional_data import (
 
 class DataInterface:
     run_info: RunInfo = None
-
-    root: Node = None
-
-    seu_log: SeuLog = None
-    golden_log: pd.Series = None
-    optional_data: OptionalData = None
-    non_register_runs: List[str] = list()
-
-    def __init__(self, run_info: RunInfo) -> None:
+    n_workers: int = None
+
+    # loaded on first use, see the properties of the same names
+    _root: Node = None
+    _nodes: Dict[str, Node] = None
+    _node_index: NodeIndex = None
+
+    _seu_log: SeuLog = None
+    _golden_log: pd.Series = None
+    _optional_data: OptionalData = None
+    _non_register_runs: List[str] = None
+
+    # number of runs each row of the SeuLog stands for, see run_weights
+    run_multiplicities: pd.Series = None
+
+    # derived from seu_log on first use, and reset by _invalidate_caches()
+    _register_index: Tuple[np.ndarray, np.ndarray] = None
+    _error_classes: pd.Series = None
+    _run_weights: pd.Series = None
+    _coverage: pd.DataFrame = None
+    # BaseTools.error_rate_tree() by (confidence, method), see get_error_rate_tree()
+    _error_rate_trees: Dict[Tuple[float, str], pd.DataFrame] = None
+
+    def __init__(self, run_info: RunInfo, n_workers: int = None) -> None:
         """
         The data-structure the user should interface with in order to get data for
         analyses.
@@ -40,51 +62,210 @@ class DataInterface:
         root of the SoC-hiearchy tree, the full SeuLog describing all parsed runs,
         the golden run information, and the runs where we could not parse a register.
 
+        All nodes of the tree can be looked up by their SoC path in the nodes
+        dictionary, e.g. data_interface.nodes["ibex_soc_wrap.ibex_soc_i"]. The
+        node_index holds the indexes used by the get_node(s)_by_* methods.
+
+        Nothing is read when the data interface is created. The register tree, the
+        golden log, and the SEU logs are each loaded the first time they are used, so
+        e.g. a session which only looks at the register tree never parses the SEU
+        logs. The SeuLog, the runs with no registers, and the optional data come out
+        of the same pass over the logs. The percent_register_tree_populated debug
+        option is printed once the SeuLog is loaded.
+
         :param run_info: Configuration object to use for parsing and interfacing with
         the data
         :type run_info: RunInfo
+        :param n_workers: Number of processes used to parse the SEU logs. Overrides
+        [DATA][n_workers] in the config file if specified, defaults to None
+        :type n_workers: int, optional
         """
         self.run_info = run_info
+        self.n_workers = n_workers
 
-        print_start_read = False
-        for option in [
-            run_info.debug.percent_register_tree_populated,
-        ]:
-            print_start_read = print_start_read or option
+    @property
+    def root(self) -> Node:
+        """
+        :return: Root of the register tree, built from the VPI file on first use
+        :rtype: Node
+        """
+        if self._root is None:
+            self._generate_register_tree(self.run_info)
 
-        self.seu_log, self.non_register_runs = DataParser.read_seu_logs(run_info)
-        self.golden_log = DataParser.read_golden_log(run_info)
+        return self._root
 
-        if print_start_read:
-            cp.print_header("Building register tree")
+    @property
+    def nodes(self) -> Dict[str, Node]:
+        """
+        :return: All nodes of the register tree by their SoC path
+        :rtype: Dict[str, Node]
+        """
+        if self._nodes is None:
+            self._generate_register_tree(self.run_info)
 
-        self._generate_register_tree(run_info)
-        self.seu_log = SeuLog(self.seu_log)
-        self.seu_log.name = self.root.name
+        return self._nodes
+
+    @property
+    def node_index(self) -> NodeIndex:
+        """
+        :return: Indexes over the nodes of the register tree
+        :rtype: NodeIndex
+        """
+        if self._node_index is None:
+            self._generate_register_tree(self.run_info)
+
+        return self._node_index
+
+    @property
+    def seu_log(self) -> SeuLog:
+        """
+        The SeuLog of all parsed runs. The SEU logs are parsed, or loaded from the
+        cache, on first use.
+
+        Assigning a new SeuLog resets everything derived from the old one.
+
+        :return: The SeuLog of all parsed runs
+        :rtype: SeuLog
+        """
+        if self._seu_log is None:
+            self._load_logs()
+
+        return self._seu_log
+
+    @seu_log.setter
+    def seu_log(self, seu_log: SeuLog) -> None:
+        self._seu_log = seu_log
+        self._invalidate_caches()
+
+    @property
+    def golden_log(self) -> pd.Series:
+        """
+        :return: The parsed golden log, read on first use
+        :rtype: pd.Series
+        """
+        if self._golden_log is None:
+            self._golden_log = DataParser.read_golden_log(self.run_info)
+
+        return self._golden_log
+
+    @property
+    def non_register_runs(self) -> List[str]:
+        """
+        :return: Runs where no register could be parsed. Loaded with the SeuLog.
+        :rtype: List[str]
+        """
+        if self._seu_log is None:
+            self._load_logs()
 
-        if not run_info.debug.percent_register_tree_populated:
-            if print_start_read:
-                cp.print_header("Built register tree")
-            return
+        return self._non_register_runs
 
-        all_nodes = list(findall_nodes(self.root))
-        all_nodes = [node for node in all_nodes if node.is_leaf]
+    @property
+    def optional_data(self) -> Union[OptionalData, None]:
+        """
+        :return: Optional data of the parsed runs, loaded with the SeuLog. None if
+        [DATA][read_optional] is off in the config file.
+        :rtype: Union[OptionalData, None]
+        """
+        if self._seu_log is None:
+            self._load_logs()
 
-        unpopulated_nodes = all_nodes.copy()
-        hit_regs = list(self.seu_log.register.unique())
+        return self._optional_data
 
-        for node in all_nodes:
-            if node.soc_path in hit_regs:
-                unpopulated_nodes.remove(node)
+    @property
+    def unpopulated_percent(self) -> float:
+        """
+        :return: Percentage of the leaves of the register tree with no parsed runs
+        :rtype: float
+        """
+        root_coverage = self.coverage["leaf_coverage"].iloc[0]
 
-        unpop_percent = len(unpopulated_nodes) * 100 / len(all_nodes)
-        cp.print_debug(f"  {unpop_percent:.2f}% of the register tree is unpopulated")
-        cp.print_header("Built register tree")
+        return float(100 * (1 - root_coverage))
 
-        if run_info.data.read_optional:
-            self.optional_data = DataParser.read_optional_logs(
-                run_info, list(self.seu_log.index)
+    def refresh(self) -> List[str]:
+        """
+        Parses runs which have been added to the data-directory since the data
+        interface was created, or since the last refresh, and appends them to the
+        SeuLog, the runs with no registers, and the optional data. Runs which were
+        already parsed are not read again, so the cost scales with the number of new
+        runs. If the cache is enabled it is updated to include the new runs.
+
+        Runs are only parsed once, so call this after new runs are fully written to
+        the data-directory, e.g. after bin/move_runs_to_data has finished.
+
+        If the config file specifies a sample of the runs, a new run is parsed only if
+        it would have been part of the sample, had it been there from the start. The
+        runs already in the SeuLog count towards [DATA][max_number_logs], so refreshes
+        never take the SeuLog past it.
+
+        If the SEU logs have not been loaded yet, they are loaded, and all parsed runs
+        are new.
+
+        A deduplicated data interface (see IntervalValidation.deduplicate()) cannot be
+        refreshed, as the runs collapsed into a representative are not in its SeuLog,
+        and would be parsed again. Refresh the original data interface, and
+        deduplicate it again instead.
+
+        :raises ValueError: Raised if the data interface is deduplicated
+        :return: Names of the newly parsed runs, both with and without registers
+        :rtype: List[str]
+        """
+        if self.run_multiplicities is not None:
+            raise ValueError("A deduplicated data interface cannot be refreshed.")
+
+        if self._seu_log is None:
+            self._load_logs()
+            return list(self._seu_log.index) + self._non_register_runs
+
+        run_info = self.run_info
+        data_dir = os.path.join(os.getcwd(), run_info.data.directory)
+
+        use_cache = run_info.data.cache and not run_info.data.limits_parsing
+        if use_cache:
+            fingerprint = DataCache.fingerprint(run_info)
+
+        parsed_runs = set(self.seu_log.index)
+        parsed_runs.update(self.non_register_runs)
+        new_runs = [
+            run
+            for run in DataParser.run_directories(data_dir)
+            if run not in parsed_runs
+        ]
+
+        # new runs are sampled at the same rate as the runs already parsed
+        if run_info.data.sample_size != -1 and len(parsed_runs) > 0:
+            max_key = max(DataParser.sample_key(run_info, run) for run in parsed_runs)
+            new_runs = DataParser.sample_runs(run_info, new_runs, max_key)
+
+        if len(new_runs) == 0:
+            return list()
+
+        new_seu_log, new_non_register_runs = DataParser.read_seu_logs(
+            run_info,
+            self.n_workers,
+            new_runs,
+            self.optional_data,
+            n_loaded_logs=len(self.seu_log),
+        )
+
+        if len(new_seu_log) > 0:
+            # the new runs get the schema of the SeuLog, whatever their values are
+            new_seu_log = SeuLog.from_parsed(new_seu_log, run_info)
+            self.seu_log = SeuLog.concat(
+                [SeuLog.from_parsed(self.seu_log, run_info), new_seu_log]
             )
+            self.seu_log.name = self.root.name
+        self._non_register_runs = self.non_register_runs + new_non_register_runs
+
+        if use_cache:
+            DataCache.save(
+                run_info,
+                fingerprint,
+                self.seu_log,
+                self.golden_log,
+                self.non_register_runs,
+            )
+
+        return list(new_seu_log.index) + new_non_register_runs
 
     def get_node_by_path(self, path: str) -> Union[Node, None]:
         """
@@ -98,19 +279,19 @@ class DataInterface:
         :return: Node found by the search. If no Node is found returns None
         :rtype: Union[Node, None]
         """
-        nodes = findall_nodes(
-            self.root, filter_=lambda node: node.soc_path.startswith(path)
-        )
-
-        if len(nodes) == 0:
-            return None
-
-        if len(nodes) == 1:
-            return nodes[0]
+        return self.node_index.get_by_prefix(path)
 
-        node_depths = [node.depth for node in nodes]
+    def get_nodes_by_paths(self, paths: List[str]) -> List[Union[Node, None]]:
+        """
+        Batch version of get_node_by_path(). Returns the node found for each path, in
+        the same order as the paths.
 
-        return nodes[node_depths.index(min(node_depths))]
+        :param paths: paths to search the nodes by
+        :type paths: List[str]
+        :return: Node found for each path, None where no node is found
+        :rtype: List[Union[Node, None]]
+        """
+        return [self.node_index.get_by_prefix(path) for path in paths]
 
     def get_node_by_name(self, name: str) -> Tuple[Node]:
         """
@@ -121,28 +302,245 @@ class DataInterface:
         :return: Tuple of nodes found in the search
         :rtype: Tuple[Node]
         """
-        return findall_nodes(self.root, filter_=lambda node: node.name == name)
+        return self.node_index.by_name.get(name, tuple())
+
+    def get_nodes_by_names(self, names: List[str]) -> List[Tuple[Node]]:
+        """
+        Batch version of get_node_by_name(). Returns the tuple of nodes found for each
+        name, in the same order as the names.
+
+        :param names: Names to search by
+        :type names: List[str]
+        :return: Tuple of nodes found for each name
+        :rtype: List[Tuple[Node]]
+        """
+        return [self.node_index.by_name.get(name, tuple()) for name in names]
 
     def get_seu_log_by_node(self, node: Node) -> SeuLog:
         """
         Use this method to query the full SeuLog for only data pertaining to a given
-        node. All data which corresponds to this node, and its ancestors, is returned.
+        node. All data which corresponds to this node, and its descendants, is
+        returned (see get_rows_by_node()).
 
         :param node: Node to query the data with
         :type node: Node
         :return: Data pertaining to the specified node
         :rtype: SeuLog
         """
-        data = self.seu_log.loc[
-            self.seu_log.apply(
-                lambda x: x["register"].startswith(node.soc_path), axis=1
-            )
-        ]
+        data = self.seu_log.iloc[self.get_rows_by_node(node)]
 
         data.name = node.name
 
         return data
 
+    def get_rows_by_node(self, node: Node) -> np.ndarray:
+        """
+        Returns the positions of the rows in the full SeuLog pertaining to a given
+        node, in the order they appear in the SeuLog. These positions can be used with
+        .iloc on anything aligned with the SeuLog, such as the error classes.
+
+        The rows of a node are the runs on the node itself, and on registers whose
+        path continues the node path with a ".", so e.g. rf_reg[1] does not take the
+        runs of rf_reg[10]. These are the runs sum_by_node() counts for the node.
+
+        The rows are looked up in an index of the registers, sorted by name, which is
+        built the first time this method is called. The node path, and the paths
+        under it, each sit in one contiguous range of the index, found by binary
+        search.
+
+        :param node: Node to query the data with
+        :type node: Node
+        :return: Row positions of the data pertaining to the specified node
+        :rtype: np.ndarray
+        """
+        if self._register_index is None:
+            self._register_index = self._build_register_index()
+        sorted_registers, order = self._register_index
+
+        path = node.soc_path
+        own = slice(
+            np.searchsorted(sorted_registers, path, side="left"),
+            np.searchsorted(sorted_registers, path, side="right"),
+        )
+        below = slice(
+            np.searchsorted(sorted_registers, path + ".", side="left"),
+            np.searchsorted(sorted_registers, path + ".\U0010ffff"),
+        )
+
+        return np.sort(np.concatenate([order[own], order[below]]))
+
+    def sum_by_node(self, per_register: pd.DataFrame) -> pd.DataFrame:
+        """
+        Sums values given per register over the subtree of every node in the register
+        tree, e.g. run counts per register into run counts per node. Each register is
+        mapped to the node with the same SoC path, or to its nearest ancestor in the
+        tree if the register itself is not a node. Registers outside the tree are
+        left out.
+
+        The registers are mapped once each, and the sums are built in a single
+        bottom-up pass over the tree (see NodeIndex.sum_subtrees()), so the cost is
+        linear in the number of registers plus the number of nodes.
+
+        :param per_register: Numeric values indexed by register, one column per value
+        :type per_register: pd.DataFrame
+        :return: Sums for every node, indexed by SoC path in pre-order, with the same
+        columns as per_register
+        :rtype: pd.DataFrame
+        """
+        node_index = self.node_index
+        values = np.zeros((len(node_index.preorder), per_register.shape[1]))
+
+        positions = [self._node_position(reg) for reg in per_register.index]
+        mapped = np.array([pos is not None for pos in positions], dtype=bool)
+        np.add.at(
+            values,
+            np.array([pos for pos in positions if pos is not None], dtype=np.int64),
+            per_register.to_numpy(dtype=float)[mapped],
+        )
+
+        return pd.DataFrame(
+            node_index.sum_subtrees(values),
+            index=[node.soc_path for node in node_index.preorder],
+            columns=per_register.columns,
+        )
+
+    @property
+    def error_classes(self) -> pd.Series:
+        """
+        The error class of every run in the SeuLog, as a categorical series aligned
+        with the SeuLog. The runs are classified once, the first time this is used,
+        and again only after the SeuLog has changed through refresh(). For the
+        definitions of each error see the error_definitions.py file.
+
+        If you modify the SeuLog in place, call _invalidate_caches() afterwards.
+
+        :return: Error class of every run
+        :rtype: pd.Series
+        """
+        if self._error_classes is None:
+            self._error_classes = self._classify_errors()
+
+        return self._error_classes
+
+    def get_error_rate_tree(
+        self, confidence: float, method: str, compute: Callable[[], pd.DataFrame]
+    ) -> pd.DataFrame:
+        """
+        The error rate tree of BaseTools.error_rate_tree() for a confidence level and
+        method of the intervals. The tree is computed by compute the first time it is
+        asked for, and kept until the SeuLog changes, e.g. through refresh(), which
+        clears it with everything else derived from the SeuLog.
+
+        :param confidence: Confidence level of the intervals
+        :type confidence: float
+        :param method: Method of the confidence intervals
+        :type method: str
+        :param compute: Computes the tree if it is not kept
+        :type compute: Callable[[], pd.DataFrame]
+        :return: A copy of the kept tree, so it can be modified freely
+        :rtype: pd.DataFrame
+        """
+        key = (confidence, method)
+        if self._error_rate_trees is None or key not in self._error_rate_trees:
+            tree = compute()
+            # computing can load the SeuLog, which clears the kept trees
+            if self._error_rate_trees is None:
+                self._error_rate_trees = dict()
+            self._error_rate_trees[key] = tree
+
+        return self._error_rate_trees[key].copy()
+
+    @property
+    def coverage(self) -> pd.DataFrame:
+        """
+        How well the injections cover the register tree, for every node: the depth of
+        the node, the number of runs injected in its subtree (n_runs), the number of
+        leaves in its subtree (n_leaves), how many of these leaves have at least one
+        run (n_covered_leaves), and the fraction of covered leaves (leaf_coverage).
+
+        The runs are counted per register once, and summed bottom-up over the tree
+        (see sum_by_node()). Sort by leaf_coverage or n_runs to find subtrees which
+        need more injections, e.g.
+        data_interface.coverage.sort_values("leaf_coverage").
+
+        :return: Coverage of every node, indexed by SoC path in pre-order
+        :rtype: pd.DataFrame
+        """
+        if self._coverage is None:
+            self._coverage = self._compute_coverage()
+
+        return self._coverage
+
+    @property
+    def run_weights(self) -> pd.Series:
+        """
+        The weight of every run in the SeuLog, as a series aligned with the SeuLog.
+        All weights are 1, unless the runs are a sample stratified by register subtree
+        ([DATA][sample_strata_depth] in the config file).
+
+        A sample of runs is picked before any log is opened, so it cannot be
+        stratified by register directly. Instead it is post-stratified: the runs are
+        grouped by the subtree at sample_strata_depth their register is in, and each
+        run is weighted by the share of the registers in reg_tree.txt in its subtree,
+        divided by the share of the sampled runs in its subtree. This assumes
+        injections are spread uniformly over the registers. Runs on registers outside
+        the tree, or above the strata depth, keep weight 1.
+
+        If a row of the SeuLog stands for several runs, e.g. after equivalent
+        injections are collapsed (see IntervalValidation.deduplicate()),
+        run_multiplicities holds the number of runs of each row, and the weight of the
+        row is multiplied by it. Rows missing from run_multiplicities stand for one
+        run.
+
+        :return: Weight of every run
+        :rtype: pd.Series
+        """
+        if self._run_weights is None:
+            self._run_weights = self._compute_run_weights()
+
+        return self._run_weights
+
+    @property
+    def run_frequencies(self) -> pd.Series:
+        """
+        The number of runs every row of the SeuLog stands for, as a series aligned
+        with the SeuLog: run_multiplicities, or 1 for rows missing from it.
+
+        :return: Number of runs of every row
+        :rtype: pd.Series
+        """
+        if self.run_multiplicities is None:
+            return pd.Series(1.0, index=self.seu_log.index)
+
+        frequencies = self.run_multiplicities.reindex(self.seu_log.index, fill_value=1)
+
+        return frequencies.astype(float)
+
+    def effective_sample_size(self, node: Node) -> float:
+        """
+        Kish's effective sample size of the runs pertaining to a node,
+        (sum of weights)^2 / (sum of squared weights), over the runs the rows stand
+        for. A row standing for f runs (see run_frequencies) counts as f runs of
+        weight w / f each, so its squared weights add up to w^2 / f. Collapsed runs
+        are runs which were simulated, with the same outcome, so deduplicating does
+        not change the effective sample size.
+
+        This is the number of runs when the runs are not a stratified sample (see
+        run_weights), and should be used as the sample size in confidence intervals.
+
+        :param node: Node to compute the effective sample size of
+        :type node: Node
+        :return: Effective sample size
+        :rtype: float
+        """
+        rows = self.get_rows_by_node(node)
+        weights = self.run_weights.to_numpy()[rows]
+        if len(weights) == 0:
+            return 0.0
+        frequencies = self.run_frequencies.to_numpy()[rows]
+
+        return float(weights.sum() ** 2 / (np.square(weights) / frequencies).sum())
+
     def get_openable_non_register_runs(self) -> List[str]:
         """
         Returns a list of runs which we can open, but where we cannot find the register
@@ -163,6 +561,210 @@ class DataInterface:
 
         return runs
 
+    def _build_register_index(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Sorts the registers of the SeuLog by name.
+
+        :return: The sorted registers, and the row position in the SeuLog of each
+        sorted register
+        :rtype: Tuple[np.ndarray, np.ndarray]
+        """
+        registers = self.seu_log["register"].to_numpy(dtype=object)
+        order = np.argsort(registers, kind="stable")
+
+        return registers[order], order
+
+    def _node_position(self, register: str) -> Union[int, None]:
+        """
+        Finds the position in NodeIndex.preorder of the node a register belongs to,
+        stripping parts off the end of the register path until it names a node.
+
+        :param register: SoC path of the register
+        :type register: str
+        :return: Position of the node, or None if the register is outside the tree
+        :rtype: Union[int, None]
+        """
+        path = register
+        while True:
+            node = self.nodes.get(path)
+            if node is not None:
+                return self.node_index.positions[node]
+            if "." not in path:
+                return None
+            path = path.rsplit(".", 1)[0]
+
+    def _classify_errors(self) -> pd.Series:
+        """
+        Classifies the error type of every run in the SeuLog, by comparing it to the
+        golden log.
+
+        :return: Error class of every run, with the error names as categories
+        :rtype: pd.Series
+        """
+        seu_log = self.seu_log
+        golden_log = self.golden_log
+
+        compare_cols = seu_log.columns.intersection(golden_log.index)
+        crit_cols = self.run_info.comparison_data.entries
+        crit_cols = crit_cols + self.run_info.seu_metadata.entries
+
+        is_critical = seu_log[crit_cols].isna().any(axis=1).to_numpy()
+        is_corruption = seu_log[compare_cols].ne(golden_log).any(axis=1).to_numpy()
+
+        codes = np.where(is_critical, 2, np.where(is_corruption, 1, 0))
+
+        return pd.Series(
+            pd.Categorical.from_codes(
+                codes,
+                categories=[
+                    SilentError.name,
+                    DataCorruptionError.name,
+                    CriticalError.name,
+                ],
+            ),
+            index=seu_log.index,
+        )
+
+    def _compute_run_weights(self) -> pd.Series:
+        """
+        Computes the post-stratification weights described in run_weights.
+
+        :return: Weight of every run, aligned with the SeuLog
+        :rtype: pd.Series
+        """
+        multiplicities = self.run_frequencies.to_numpy()
+        weights = multiplicities.copy()
+
+        data = self.run_info.data
+        if data.sample_size == -1 or data.sample_strata_depth == -1:
+            return pd.Series(weights, index=self.seu_log.index)
+
+        node_index = self.node_index
+        depth = data.sample_strata_depth
+
+        # number of registers (leaves) in the subtree of each node
+        is_leaf = np.array([node.is_leaf for node in node_index.preorder], dtype=float)
+        n_registers = node_index.sum_subtrees(is_leaf[:, None])[:, 0]
+
+        # stratum of each register: its ancestor at the strata depth, or -1
+        registers = self.seu_log["register"].astype("category")
+        strata_by_category = list()
+        for register in registers.cat.categories:
+            position = self._node_position(register)
+            if position is None or node_index.depths[position] < depth:
+                strata_by_category.append(-1)
+                continue
+            while node_index.depths[position] > depth:
+                position = node_index.parent_positions[position]
+            strata_by_category.append(position)
+
+        codes = registers.cat.codes.to_numpy()
+        strata = np.array(strata_by_category, dtype=np.int64)[codes]
+        strata[codes == -1] = -1
+
+        in_strata = strata != -1
+        n_sampled = np.bincount(
+            strata[in_strata],
+            weights=multiplicities[in_strata],
+            minlength=len(node_index.preorder),
+        )
+        stratum_ids = np.flatnonzero(n_sampled)
+        population_share = n_registers[stratum_ids] / n_registers[stratum_ids].sum()
+        sample_share = n_sampled[stratum_ids] / n_sampled.sum()
+
+        stratum_weights = np.zeros(len(node_index.preorder))
+        stratum_weights[stratum_ids] = population_share / sample_share
+        weights[in_strata] *= stratum_weights[strata[in_strata]]
+
+        return pd.Series(weights, index=self.seu_log.index)
+
+    def _compute_coverage(self) -> pd.DataFrame:
+        """
+        Computes the coverage of every node, see coverage.
+
+        :return: Coverage of every node, indexed by SoC path in pre-order
+        :rtype: pd.DataFrame
+        """
+        node_index = self.node_index
+        runs_per_register = self.seu_log["register"].value_counts(sort=False)
+        n_runs = self.sum_by_node(runs_per_register.to_frame("n_runs"))["n_runs"]
+
+        # the subtree of a leaf is only the leaf, so its sum is its own count
+        is_leaf = np.array([node.is_leaf for node in node_index.preorder], dtype=bool)
+        is_covered = is_leaf & (n_runs.to_numpy() > 0)
+        leaf_counts = node_index.sum_subtrees(
+            np.column_stack([is_leaf, is_covered]).astype(np.int64)
+        )
+
+        coverage = pd.DataFrame(
+            {
+                "depth": node_index.depths,
+                "n_runs": n_runs.to_numpy().astype(np.int64),
+                "n_leaves": leaf_counts[:, 0],
+                "n_covered_leaves": leaf_counts[:, 1],
+            },
+            index=n_runs.index,
+        )
+        coverage["leaf_coverage"] = coverage["n_covered_leaves"] / coverage["n_leaves"]
+
+        return coverage
+
+    def _invalidate_caches(self) -> None:
+        """
+        Resets everything derived from the SeuLog. Must be called whenever the SeuLog
+        changes.
+        """
+        self._register_index = None
+        self._error_classes = None
+        self._run_weights = None
+        self._coverage = None
+        self._error_rate_trees = None
+
+    def _load_logs(self) -> None:
+        """
+        Parses the SEU logs, or loads them from the cache if it is enabled and up to
+        date, and sets the SeuLog, the runs with no registers, and the optional data.
+        """
+        run_info = self.run_info
+
+        # parsing cut short by a limit is not a complete picture of the directory
+        use_cache = run_info.data.cache and not run_info.data.limits_parsing
+        cached = None
+        if use_cache:
+            fingerprint = DataCache.fingerprint(run_info)
+            cached = DataCache.load(run_info, fingerprint)
+
+        optional_data = OptionalData(run_info) if run_info.data.read_optional else None
+
+        if cached is None:
+            # the optional data is read in the same pass as the SEU logs
+            seu_log, non_register_runs = DataParser.read_seu_logs(
+                run_info, self.n_workers, optional_data=optional_data
+            )
+            seu_log = SeuLog.from_parsed(seu_log, run_info)
+            if use_cache:
+                DataCache.save(
+                    run_info, fingerprint, seu_log, self.golden_log, non_register_runs
+                )
+        else:
+            seu_log, self._golden_log, non_register_runs = cached
+            seu_log = SeuLog.from_parsed(seu_log, run_info)
+            if optional_data is not None:
+                DataParser.read_optional_logs(
+                    run_info, list(seu_log.index), optional_data
+                )
+
+        self.seu_log = seu_log
+        self.seu_log.name = self.root.name
+        self._non_register_runs = non_register_runs
+        self._optional_data = optional_data
+
+        if run_info.debug.percent_register_tree_populated:
+            unpop_percent = self.unpopulated_percent
+            cp.print_debug(
+                f"  {unpop_percent:.2f}% of the register tree is unpopulated"
+            )
+
     def _generate_register_tree(self, run_info: RunInfo) -> None:
         """
         Uses the VPI entry in the config file (*.ini) to generate the register tree.
@@ -177,24 +779,57 @@ class DataInterface:
             register_paths = f.readlines()
         register_paths = [path.strip() for path in register_paths]
 
-        root_path = register_paths[0].split(run_info.seu_metadata.register_delimiter)[0]
-        self.root = Node(root_path, root_path)
+        if run_info.debug.percent_register_tree_populated:
+            cp.print_header("Building register tree")
+
+        self._root, self._nodes = self._build_register_tree(
+            register_paths, run_info.seu_metadata.register_delimiter
+        )
+        self._node_index = NodeIndex(self._root, self._nodes)
+
+        if run_info.debug.percent_register_tree_populated:
+            cp.print_header("Built register tree")
+
+    @staticmethod
+    def _build_register_tree(
+        register_paths: List[str], register_delimiter: str
+    ) -> Tuple[Node, Dict[str, Node]]:
+        """
+        Builds the register tree from a list of register paths. The children of each
+        node are kept in a dictionary by name while building, so finding or adding a
+        child is O(1), and building the tree is linear in the total number of path
+        parts.
+
+        :param register_paths: Paths of all registers in the SoC
+        :type register_paths: List[str]
+        :param register_delimiter: Delimiter between the parts of a register path
+        :type register_delimiter: str
+        :return: The root of the tree, and a dictionary of all nodes by their SoC path
+        :rtype: Tuple[Node, Dict[str, Node]]
+        """
+        root_path = register_paths[0].split(register_delimiter)[0]
+        root = Node(root_path, root_path)
+
+        nodes = {root_path: root}
+        children: Dict[Node, Dict[str, Node]] = {root: dict()}
 
         for reg_path in register_paths:
-            parts = reg_path.split(run_info.seu_metadata.register_delimiter)
-            current_node = self.root
+            parts = reg_path.split(register_delimiter)
+            current_node = root
             path_to_current_node = parts[0]
 
             for part in parts[1:]:
                 path_to_current_node += f".{part}"
-                current_node_children_names = [
-                    child.name for child in current_node.children
-                ]
-                if part not in current_node_children_names:
-                    current_node = Node(
+                child = children[current_node].get(part)
+
+                if child is None:
+                    child = Node(
                         name=part, parent=current_node, soc_path=path_to_current_node
                     )
-                else:
-                    current_node = [
-                        child for child in current_node.children if child.name == part
-                    ][0]
+                    children[current_node][part] = child
+                    children[child] = dict()
+                    nodes.setdefault(path_to_current_node, child)
+
+                current_node = child
+
+        return root, nodes
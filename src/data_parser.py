@@ -1,13 +1,18 @@
-from typing import Dict, List, Tuple
+from typing import Dict, List, Tuple, Union
 from time import time as current_time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+import hashlib
 import os
 import sys
 
 import pandas as pd
 import numpy as np
+import psutil
 from tqdm import tqdm
 
 from .run_info.run_info import RunInfo
+from .log_matcher import LogMatcher
+from .analysis.structures.seu_log import SeuLog, SeuLogBuilder
 from .colorprint import ColorPrinter as cp
 
 # if you want to import optional data of some sort you need to change the import here
@@ -21,6 +26,13 @@ from .analysis.structures.optional_data.ibexhwsec_optional_data import (
 
 
 class DataParser:
+    # number of runs handed to a worker at a time when parsing in parallel
+    chunk_size: int = 256
+    # number of chunks per worker which are parsed, or waiting to be added, at once
+    chunks_per_worker: int = 2
+    # number of runs parsed between checks of [DATA][max_ram_usage] in serial parsing
+    ram_check_interval: int = 64
+
     @classmethod
     def read_golden_log(cls, run_info: RunInfo) -> pd.Series:
         """
@@ -32,40 +44,76 @@ class DataParser:
         this is the case one should make sure the configuration file patterns matches
         the log file.
         :return: Returns a series containing the information in the golden log specified
-        by the configuration file.
+        by the configuration file. Escape sequences are stripped from the values, as
+        they are from the SEU logs (see SeuLog.strip_escapes()).
         :rtype: pd.Series
         """
-        log = dict()
-        unfound_info = [info for info in run_info.comparison_data.entries]
-        info_to_find = unfound_info.copy()
+        matcher = LogMatcher.from_comparison_data(run_info)
         path = os.path.join(run_info.data.directory, run_info.data.golden)
-        with open(path, "r") as f:
-            lines = f.readlines()
-
-        for info in info_to_find:
-            match_pattern = getattr(run_info.comparison_data, info)
-            for line in lines:
-                if match_pattern in line:
-                    log[info] = line.split(match_pattern)[1].strip()
-                    unfound_info.remove(info)
-                    break
+        with open(path, "rb") as f:
+            text = f.read()
+
+        found = matcher.match(text)
+        log = {info: found[info] for info in matcher.entries if info in found}
+        unfound_info = [info for info in matcher.entries if info not in found]
 
         if len(unfound_info) > 0:
             raise ValueError(f"Could not find {unfound_info} in golden log")
 
-        return pd.Series(log)
+        return SeuLog.strip_escapes(pd.Series(log, dtype=object))
 
     @classmethod
-    def read_seu_logs(cls, run_info: RunInfo) -> Tuple[pd.DataFrame, List[str]]:
+    def read_seu_logs(
+        cls,
+        run_info: RunInfo,
+        n_workers: int = None,
+        runs: List[str] = None,
+        optional_data: OptionalData = None,
+        n_loaded_logs: int = 0,
+    ) -> Tuple[SeuLog, List[str]]:
         """
         Finds all runs in the data-directory, and iterates through them to read all
         runs. Note this method calls the _read_single_seu_log() method to parse single
         logs.
 
+        If [DATA][sample_size] is set in the config file, only a seeded random sample
+        of the runs is parsed, see sample_runs().
+
+        If more than one worker is used the runs are split into chunks, which are parsed
+        in a process pool. The chunks are merged in the order of os.listdir, so the
+        output is identical to the output of the serial parser. At most
+        chunks_per_worker chunks per worker are submitted and not yet merged, so the
+        parsed results waiting for an earlier chunk stay bounded.
+
+        The parsed values are streamed into a SeuLogBuilder column by column, so the
+        SeuLog is built in its typed form (see SeuLog.from_parsed()) without holding
+        every run as a dictionary of strings.
+
+        If an optional data object is given, the line handlers of the object (see
+        BaseOptionalData.get_line_handlers()) are run over each log in the same pass,
+        so every log is only read once.
+
+        The logs already loaded, e.g. by the data interface before a refresh, count
+        towards [DATA][max_number_logs]. [DATA][max_ram_usage] is checked after every
+        chunk when parsing in parallel, and every ram_check_interval runs otherwise.
+
         :param run_info: Configuration object
         :type run_info: RunInfo
+        :param n_workers: Number of processes used for parsing. Overrides the
+        [DATA][n_workers] entry of the config file if specified. -1 uses all cores,
+        defaults to None
+        :type n_workers: int, optional
+        :param runs: Names of the run directories to parse. If None every directory in
+        the data-directory is parsed, or a sample of them if sampling is configured,
+        defaults to None
+        :type runs: List[str], optional
+        :param optional_data: Optional data object to add the optional data of the
+        parsed runs to, defaults to None
+        :type optional_data: OptionalData, optional
+        :param n_loaded_logs: Number of logs loaded before this call, defaults to 0
+        :type n_loaded_logs: int, optional
         :return: Returns the parsed logs, and a list of runs with no registers
-        :rtype: Tuple[pd.DataFrame, List[str]]
+        :rtype: Tuple[SeuLog, List[str]]
         """
         err_str = "Error string not set in run_info\n"
         err_str += f"Check {run_info.path} SEU_METADATA section for entry named "
@@ -76,11 +124,21 @@ class DataParser:
             print("Exiting...")
             sys.exit(1)
 
-        run_logs = dict()
+        if n_workers is None:
+            n_workers = run_info.data.n_workers
+        if n_workers == -1:
+            n_workers = os.cpu_count()
+
         non_reg_runs = list()
 
         info_to_find = run_info.seu_metadata.entries.copy()
         info_to_find += run_info.comparison_data.entries.copy()
+        matcher = LogMatcher.from_seu_metadata(run_info, info_to_find)
+        builder = SeuLogBuilder(run_info, list(matcher.entries))
+        # an empty copy is handed to the workers, the records are added to the original
+        optional_reader = None
+        if optional_data is not None and len(optional_data.get_line_handlers()) > 0:
+            optional_reader = type(optional_data)(run_info)
         # if run_info.data.read_optional:
         #     if not run_info.optional_data.entries:
         #         print(err_str)
@@ -91,6 +149,11 @@ class DataParser:
         timeout = run_info.data.timeout
         should_timeout = timeout != -1
         n_failed_reads = 0
+        # runs which were read, or found not to be runs, before parsing stopped
+        n_read_runs = 0
+        # the memory is measured on this process, where the parsed logs are kept
+        process = psutil.Process() if run_info.data.max_ram_usage != -1 else None
+        stop_reason = cls._limit_reached(run_info, n_loaded_logs, process)
 
         print_start_read = False
         for option in [
@@ -102,50 +165,237 @@ class DataParser:
         if print_start_read:
             cp.print_header("Parsing SEU logs...")
 
-        _iter = os.listdir(os.path.join(os.getcwd(), run_info.data.directory))
-        iter = tqdm(_iter) if run_info.debug.loading_bar_on_data_parsing else _iter
+        data_dir = os.path.join(os.getcwd(), run_info.data.directory)
+        if runs is not None:
+            _iter = runs
+        elif run_info.data.sample_size != -1:
+            _iter = cls.sample_runs(run_info, cls.run_directories(data_dir))
+        else:
+            _iter = cls.run_directories(data_dir)
+
+        if stop_reason is None and n_workers > 1:
+            chunks = [
+                _iter[i : i + cls.chunk_size]
+                for i in range(0, len(_iter), cls.chunk_size)
+            ]
+            # chunks finish out of order, but are added to the builder in order
+            finished_chunks = dict()
+            next_chunk = 0
+            bar = None
+            if run_info.debug.loading_bar_on_data_parsing:
+                bar = tqdm(total=len(_iter))
+
+            executor = ProcessPoolExecutor(max_workers=n_workers)
+            # chunks being parsed, or parsed and waiting for an earlier chunk, are
+            # bounded, so a limit stops the parsing before the results pile up
+            window = cls.chunks_per_worker * n_workers
+            futures = dict()
+            next_submit = 0
+            while stop_reason is None:
+                while (
+                    next_submit < len(chunks)
+                    and len(futures) + len(finished_chunks) < window
+                ):
+                    future = executor.submit(
+                        cls._read_seu_log_chunk,
+                        run_info,
+                        data_dir,
+                        chunks[next_submit],
+                        matcher,
+                        optional_reader,
+                    )
+                    futures[future] = next_submit
+                    next_submit += 1
+                if len(futures) == 0:
+                    break
 
-        for run in iter:
-            if should_timeout:
-                if current_time() - curr_time > timeout:
-                    print(f"Timed out after {timeout} seconds")
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    i = futures.pop(future)
+                    finished_chunks[i] = future.result()
+                    if bar is not None:
+                        bar.update(len(chunks[i]))
+
+                while stop_reason is None and next_chunk in finished_chunks:
+                    failed_reads, read_runs = cls._add_chunk(
+                        run_info,
+                        builder,
+                        n_loaded_logs,
+                        non_reg_runs,
+                        optional_data,
+                        chunks[next_chunk],
+                        finished_chunks.pop(next_chunk),
+                    )
+                    n_failed_reads += failed_reads
+                    n_read_runs += read_runs
+                    next_chunk += 1
+                    stop_reason = cls._limit_reached(
+                        run_info, n_loaded_logs + len(builder), process
+                    )
+
+                if stop_reason is None and should_timeout:
+                    if current_time() - curr_time > timeout:
+                        stop_reason = f"Timed out after {timeout} seconds"
+            executor.shutdown(wait=True, cancel_futures=True)
+            if bar is not None:
+                bar.close()
+
+            # after a timeout, chunks which finished out of order are still used
+            for i in sorted(finished_chunks):
+                n_logs = n_loaded_logs + len(builder)
+                if cls._limit_reached(run_info, n_logs, process) is not None:
                     break
 
-            dir_path = path = os.path.join(os.getcwd(), run_info.data.directory, run)
-            if not os.path.isdir(dir_path):
-                continue
+                failed_reads, read_runs = cls._add_chunk(
+                    run_info,
+                    builder,
+                    n_loaded_logs,
+                    non_reg_runs,
+                    optional_data,
+                    chunks[i],
+                    finished_chunks[i],
+                )
+                n_failed_reads += failed_reads
+                n_read_runs += read_runs
+        elif stop_reason is None:
+            iter = tqdm(_iter) if run_info.debug.loading_bar_on_data_parsing else _iter
+
+            for i, run in enumerate(iter):
+                if should_timeout:
+                    if current_time() - curr_time > timeout:
+                        stop_reason = f"Timed out after {timeout} seconds"
+                        break
+
+                check_ram = i % cls.ram_check_interval == 0
+                stop_reason = cls._limit_reached(
+                    run_info,
+                    n_loaded_logs + len(builder),
+                    process if check_ram else None,
+                )
+                if stop_reason is not None:
+                    break
 
-            if not run_info.data.seu in os.listdir(dir_path):
-                continue
+                failed_reads, read_runs = cls._add_chunk(
+                    run_info,
+                    builder,
+                    n_loaded_logs,
+                    non_reg_runs,
+                    optional_data,
+                    [run],
+                    cls._read_seu_log_chunk(
+                        run_info, data_dir, [run], matcher, optional_reader
+                    ),
+                )
+                n_failed_reads += failed_reads
+                n_read_runs += read_runs
+
+        if stop_reason is not None:
+            print(stop_reason)
+            print(f"Skipped {len(_iter) - n_read_runs} of {len(_iter)} runs")
+
+        if run_info.debug.percent_failed_reads and len(builder) > 0:
+            _str = f"  Parsed {len(builder)} logs, percent failed reads: "
+            _str += f"{n_failed_reads / len(builder) * 100:.2f}%"
+            cp.print_bold_debug(_str)
 
-            path = os.path.join(
-                os.getcwd(), run_info.data.directory, run, run_info.data.seu
-            )
-            log_dict, found_reg, failed_read = cls._read_single_seu_log(
-                run_info, path, info_to_find
-            )
+        if print_start_read:
+            cp.print_header("Done parsing SEU logs")
 
-            n_failed_reads += failed_read
+        return builder.build(), non_reg_runs
 
-            if found_reg:
-                run_logs[run] = log_dict
-            else:
-                non_reg_runs.append(run)
+    @classmethod
+    def sample_runs(
+        cls, run_info: RunInfo, runs: List[str], max_key: int = None
+    ) -> List[str]:
+        """
+        Picks a seeded, uniform random sample of [DATA][sample_size] runs, from the run
+        names alone, so no file is opened for runs which are not sampled.
 
-        if run_info.debug.percent_failed_reads:
-            _str = f"  Parsed {len(run_logs)} logs, percent failed reads: "
-            _str += f"{n_failed_reads / len(run_logs) * 100:.2f}%"
-            cp.print_bold_debug(_str)
+        Every run gets a pseudo-random key from its name and [DATA][sample_seed] (see
+        sample_key()), and the runs with the smallest keys are sampled. This is a
+        uniform sample without replacement, and it does not depend on the order
+        os.listdir returns the runs in, so the same seed gives the same sample on every
+        machine.
 
-        if print_start_read:
-            cp.print_header("Done parsing SEU logs")
+        :param run_info: Configuration object
+        :type run_info: RunInfo
+        :param runs: Names of the runs to sample from
+        :type runs: List[str]
+        :param max_key: If specified, all runs with a key up to max_key are sampled
+        instead. Used to extend a sample to runs added later, at the same rate,
+        defaults to None
+        :type max_key: int, optional
+        :return: The sampled runs, in the same order as runs
+        :rtype: List[str]
+        """
+        keys = [cls.sample_key(run_info, run) for run in runs]
+
+        if max_key is None:
+            if len(runs) <= run_info.data.sample_size:
+                return list(runs)
+            max_key = sorted(keys)[run_info.data.sample_size - 1]
+
+        return [run for run, key in zip(runs, keys) if key <= max_key]
+
+    @classmethod
+    def sample_key(cls, run_info: RunInfo, run: str) -> int:
+        """
+        The pseudo-random key of a run used by sample_runs().
+
+        :param run_info: Configuration object
+        :type run_info: RunInfo
+        :param run: Name of the run
+        :type run: str
+        :return: Key of the run, a 64-bit hash of the sample seed and the run name
+        :rtype: int
+        """
+        digest = hashlib.blake2b(
+            f"{run_info.data.sample_seed}\0{run}".encode(), digest_size=8
+        ).digest()
 
-        return pd.DataFrame(run_logs).T, non_reg_runs
+        return int.from_bytes(digest, "big")
+
+    @classmethod
+    def run_directories(cls, data_dir: str) -> List[str]:
+        """
+        Lists the directories in the data-directory, which are the candidate runs.
+        Hidden directories, such as the cache, are left out.
+
+        :param data_dir: Absolute path to the data-directory
+        :type data_dir: str
+        :return: Names of the directories, in the order of os.listdir
+        :rtype: List[str]
+        """
+        with os.scandir(data_dir) as entries:
+            return [
+                entry.name
+                for entry in entries
+                if entry.is_dir() and not entry.name.startswith(".")
+            ]
 
     @classmethod
     def read_optional_logs(
-        cls, run_info: RunInfo, seu_parsed_runs: List[str]
+        cls,
+        run_info: RunInfo,
+        seu_parsed_runs: List[str],
+        optional_data: OptionalData = None,
     ) -> OptionalData:
+        """
+        Reads the optional data of the given runs, in a pass of its own. The optional
+        data is normally read while parsing the SEU logs (see read_seu_logs()), so this
+        is only needed when the logs are not parsed, e.g. when they are loaded from the
+        cache.
+
+        :param run_info: Configuration object
+        :type run_info: RunInfo
+        :param seu_parsed_runs: Runs to read the optional data of
+        :type seu_parsed_runs: List[str]
+        :param optional_data: Optional data object to add the runs to. If None a new
+        object is created, defaults to None
+        :type optional_data: OptionalData, optional
+        :return: Optional data of the runs
+        :rtype: OptionalData
+        """
         data_dir = os.path.join(os.getcwd(), run_info.data.directory)
         _runs = [os.path.join(data_dir, dir) for dir in seu_parsed_runs]
         runs = [dir for dir in _runs if os.path.isdir(dir)]
@@ -158,7 +408,8 @@ class DataParser:
         ]:
             print_start_read = print_start_read or option
 
-        optional_data = OptionalData(run_info=run_info)
+        if optional_data is None:
+            optional_data = OptionalData(run_info=run_info)
 
         if print_start_read:
             cp.print_header("Parsing SEU logs for optional data...")
@@ -176,55 +427,292 @@ class DataParser:
 
         return optional_data
 
+    @classmethod
+    def _read_seu_log_chunk(
+        cls,
+        run_info: RunInfo,
+        data_dir: str,
+        runs: List[str],
+        matcher: LogMatcher,
+        optional_reader: OptionalData = None,
+    ) -> Tuple[
+        List[str], Dict[str, list], Union[List[list], None], List[str], List[str]
+    ]:
+        """
+        Parses a chunk of runs. This is the unit of work handed to each process when
+        parsing in parallel, and it is called with a single run when parsing serially.
+
+        The parsed values are returned column by column, which is what the
+        SeuLogBuilder takes, and is cheaper to send between processes than a
+        dictionary per run.
+
+        :param run_info: Configuration object
+        :type run_info: RunInfo
+        :param data_dir: Absolute path to the data-directory
+        :type data_dir: str
+        :param runs: Names of the run directories in the chunk
+        :type runs: List[str]
+        :param matcher: Matcher for the information that should be found by the parser
+        :type matcher: LogMatcher
+        :param optional_reader: Optional data object whose line handlers are run over
+        each log, defaults to None
+        :type optional_reader: OptionalData, optional
+        :return: The runs with registers, the parsed values of these runs for each
+        entry, the optional data records of these runs (None without an optional
+        reader), the runs with no registers, and the runs which could not be read
+        :rtype: Tuple[List[str], Dict[str, list], Union[List[list], None], List[str],
+        List[str]]
+        """
+        parsed_runs = list()
+        values = {info: list() for info in matcher.entries}
+        records = None if optional_reader is None else list()
+        non_reg_runs = list()
+        failed_runs = list()
+
+        for run in runs:
+            dir_path = os.path.join(data_dir, run)
+            if not os.path.isdir(dir_path):
+                continue
+
+            if not run_info.data.seu in os.listdir(dir_path):
+                continue
+
+            path = os.path.join(dir_path, run_info.data.seu)
+            log_dict, found_reg, failed_read, run_records = cls._read_single_seu_log(
+                run_info, path, matcher, optional_reader
+            )
+
+            if failed_read:
+                failed_runs.append(run)
+
+            if found_reg:
+                parsed_runs.append(run)
+                for info, value in log_dict.items():
+                    values[info].append(value)
+                if records is not None:
+                    records.append(run_records)
+            else:
+                non_reg_runs.append(run)
+
+        return parsed_runs, values, records, non_reg_runs, failed_runs
+
+    @classmethod
+    def _add_chunk(
+        cls,
+        run_info: RunInfo,
+        builder: SeuLogBuilder,
+        n_loaded_logs: int,
+        non_reg_runs: List[str],
+        optional_data: Union[OptionalData, None],
+        runs: List[str],
+        chunk_result: Tuple[
+            List[str], Dict[str, list], Union[List[list], None], List[str], List[str]
+        ],
+    ) -> Tuple[int, int]:
+        """
+        Adds the result of _read_seu_log_chunk() to the builder, the runs with no
+        registers, and the optional data. If the chunk would take the loaded logs and
+        the builder past [DATA][max_number_logs], the chunk is cut after the run of the
+        last log which fits, and the runs after the cut are left out, as if they were
+        never read.
+
+        :param run_info: Configuration object
+        :type run_info: RunInfo
+        :param builder: Builder of the SeuLog
+        :type builder: SeuLogBuilder
+        :param n_loaded_logs: Number of logs loaded before the builder was created
+        :type n_loaded_logs: int
+        :param non_reg_runs: Runs with no registers, extended in place
+        :type non_reg_runs: List[str]
+        :param optional_data: Optional data object to add the records of the chunk to,
+        if the chunk was read with an optional reader
+        :type optional_data: Union[OptionalData, None]
+        :param runs: Names of the run directories in the chunk
+        :type runs: List[str]
+        :param chunk_result: Result of _read_seu_log_chunk() on the runs
+        :type chunk_result: Tuple[List[str], Dict[str, list], Union[List[list], None],
+        List[str], List[str]]
+        :return: Number of failed reads, and number of runs of the chunk which were used
+        :rtype: Tuple[int, int]
+        """
+        parsed_runs, values, records, chunk_non_reg_runs, failed_runs = chunk_result
+        n_read_runs = len(runs)
+
+        max_number_logs = run_info.data.max_number_logs
+        if max_number_logs != -1:
+            n_kept = max_number_logs - n_loaded_logs - len(builder)
+
+            if n_kept < len(parsed_runs):
+                if n_kept > 0:
+                    n_read_runs = runs.index(parsed_runs[n_kept - 1]) + 1
+                else:
+                    n_read_runs = 0
+                read_runs = set(runs[:n_read_runs])
+
+                parsed_runs = parsed_runs[:n_kept]
+                values = {info: value[:n_kept] for info, value in values.items()}
+                if records is not None:
+                    records = records[:n_kept]
+                chunk_non_reg_runs = [
+                    run for run in chunk_non_reg_runs if run in read_runs
+                ]
+                failed_runs = [run for run in failed_runs if run in read_runs]
+
+        builder.extend(parsed_runs, values)
+        non_reg_runs += chunk_non_reg_runs
+        if records is not None:
+            for run, run_records in zip(parsed_runs, records):
+                optional_data.add_records(run, run_records)
+
+        return len(failed_runs), n_read_runs
+
+    @classmethod
+    def _limit_reached(
+        cls,
+        run_info: RunInfo,
+        n_parsed_logs: int,
+        process: Union[psutil.Process, None] = None,
+    ) -> Union[str, None]:
+        """
+        Checks the [DATA][max_number_logs] and [DATA][max_ram_usage] limits of the
+        config file. The memory used is the resident memory of the given process, and
+        it is only checked if a process is given.
+
+        :param run_info: Configuration object
+        :type run_info: RunInfo
+        :param n_parsed_logs: Number of logs loaded so far
+        :type n_parsed_logs: int
+        :param process: Process to measure the memory of, defaults to None
+        :type process: Union[psutil.Process, None], optional
+        :return: Description of the limit which is reached, or None if no limit is
+        reached
+        :rtype: Union[str, None]
+        """
+        max_number_logs = run_info.data.max_number_logs
+        if max_number_logs != -1 and n_parsed_logs >= max_number_logs:
+            return f"Reached max_number_logs after parsing {n_parsed_logs} logs"
+
+        max_ram_usage = run_info.data.max_ram_usage
+        if max_ram_usage != -1 and process is not None:
+            ram_usage = process.memory_info().rss / 2**20
+            if ram_usage >= max_ram_usage:
+                _str = f"Reached max_ram_usage of {max_ram_usage} MB after parsing "
+                _str += f"{n_parsed_logs} logs"
+                return _str
+
+        return None
+
     @classmethod
     def _read_single_seu_log(
-        cls, run_info: RunInfo, path: str, info_to_find: List[str]
-    ) -> Tuple[Dict[str, str], bool, int]:
+        cls,
+        run_info: RunInfo,
+        path: str,
+        matcher: LogMatcher,
+        optional_reader: OptionalData = None,
+    ) -> Tuple[Dict[str, str], bool, int, Union[list, None]]:
         """
         Parses a single seu_log.
 
-        Uses the configuration object to check which information has to be parsed, and
-        if this information is not found the method exits in a way that the
-        _read_all_seu_logs() methods handles
+        Uses the matcher built from the configuration object to find the information
+        that has to be parsed, and if this information is not found the method exits in
+        a way that read_seu_logs() and _read_seu_log_chunk() handle. If an optional
+        reader is given, its line handlers are run over the same text.
+
+        The log is read as bytes, and only the values found are decoded, so a byte
+        which is not valid UTF-8 only fails the read if it is inside one of the values.
+
+        If [DATA][read_head_kb] or [DATA][read_tail_kb] is set in the config file, and
+        there is no optional reader, only the head and tail of the log are read, see
+        _match_head_and_tail().
 
         :param run_info: Configuration object
         :type run_info: RunInfo
         :param path: Path for the individual run
         :type path: str
-        :param info_to_find: A list containing what information should be found by the
-        parser.
-        :type info_to_find: List[str]
+        :param matcher: Matcher for the information that should be found by the parser
+        :type matcher: LogMatcher
+        :param optional_reader: Optional data object whose line handlers are run over
+        the log, defaults to None
+        :type optional_reader: OptionalData, optional
         :return: A dictionary containing the found information, a boolean on whether the
-        parsing was succesful, and an exit code (0=openable file, 1=unopanable file)
-        :rtype: Tuple[Dict[str, str], bool, int]
+        parsing was succesful, an exit code (0=readable values, 1=undecodable value),
+        and the optional data records of the log (None without an optional reader)
+        :rtype: Tuple[Dict[str, str], bool, int, Union[list, None]]
         """
-        seu_log_dict = dict()
-        unfound_info = info_to_find.copy()
-
         try:
-            with open(path, "r") as f:
-                lines = f.readlines()
+            # the handlers of the optional data need the full log
+            if run_info.data.reads_partially and optional_reader is None:
+                text = None
+                found = cls._match_head_and_tail(run_info, path, matcher)
+            else:
+                with open(path, "rb") as f:
+                    text = f.read()
+                found = matcher.match(text)
         except UnicodeDecodeError as e:
             if run_info.debug.error_utf_parsing:
                 cp.print_debug(f"  Could not read {path}")
                 cp.print_debug("  " + str(e))
-            return None, False, 1
+            return None, False, 1, None
 
-        for info in info_to_find:
-            found_info = False
-            if hasattr(run_info.seu_metadata, info):
-                match_pattern = getattr(run_info.seu_metadata, info)
-            else:
-                match_pattern = getattr(run_info.comparison_data, info)
+        seu_log_dict = {info: found.get(info, np.nan) for info in matcher.entries}
 
-            for line in lines:
-                if match_pattern in line:
-                    seu_log_dict[info] = line.split(match_pattern)[1].strip()
-                    unfound_info.remove(info)
-                    found_info = True
-                    break
+        records = None
+        if optional_reader is not None:
+            records = optional_reader.read_records(text)
+
+        return seu_log_dict, "register" in found, 0, records
 
-            if not found_info:
-                seu_log_dict[info] = np.nan
+    @classmethod
+    def _match_head_and_tail(
+        cls, run_info: RunInfo, path: str, matcher: LogMatcher
+    ) -> Dict[str, str]:
+        """
+        Finds the entries of the matcher in the first [DATA][read_head_kb] and the last
+        [DATA][read_tail_kb] KB of a log, and reads the full log only if some entries
+        are in neither. The metadata of the injection is printed near the top of the
+        logs, and the CRCs at the end, so for complete runs the simulator output in
+        between is never read. Runs which stop before the CRCs are printed are always
+        read in full.
+
+        Lines cut off at the end of the head or the start of the tail are left out. An
+        entry found in the head is the same as in the full log. An entry found in the
+        tail is the first line matching it in the tail, which is only the first line in
+        the full log if the pattern does not also appear before the tail.
 
-        return seu_log_dict, not ("register" in unfound_info), 0
+        :param run_info: Configuration object
+        :type run_info: RunInfo
+        :param path: Path of the log
+        :type path: str
+        :param matcher: Matcher for the information that should be found by the parser
+        :type matcher: LogMatcher
+        :raises UnicodeDecodeError: Raised if a value found is not valid UTF-8
+        :return: Maps the name of each found entry to its value
+        :rtype: Dict[str, str]
+        """
+        head_size = max(run_info.data.read_head_kb, 0) * 1024
+        tail_size = max(run_info.data.read_tail_kb, 0) * 1024
+        size = os.path.getsize(path)
+
+        with open(path, "rb") as f:
+            if head_size + tail_size >= size:
+                return matcher.match(f.read())
+
+            head = f.read(head_size)
+            head = head[: head.rfind(b"\n") + 1]
+            found = matcher.match(head)
+
+            missing = [info for info in matcher.entries if info not in found]
+            if len(missing) > 0 and tail_size > 0:
+                # one byte more, to know if the tail starts at the start of a line
+                f.seek(size - tail_size - 1)
+                tail = f.read()
+                newline = tail.find(b"\n")
+                tail = tail[newline + 1 :] if newline != -1 else b""
+                found.update(matcher.match(tail, missing))
+
+            missing = [info for info in matcher.entries if info not in found]
+            if len(missing) > 0:
+                f.seek(0)
+                found.update(matcher.match(f.read(), missing))
+
+        return found
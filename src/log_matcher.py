@@ -0,0 +1,119 @@
+"""
+Multi-pattern matcher used by the data parser to extract information from logs.
+"""
+from __future__ import annotations
+from typing import Dict, List, Union
+
+from .run_info.run_info import RunInfo
+
+
+class LogMatcher:
+    entries: Dict[str, str] = None
+    encoding: str = "utf-8"
+
+    def __init__(self, entries: Dict[str, str]) -> None:
+        """
+        Finds the first line matching each entry in a log, without splitting the log
+        into lines.
+
+        The first line containing a match pattern is the line holding the first
+        occurrence of the pattern in the full text, so each pattern is located with a
+        single str.find over the text, which stops at the first occurrence. Only the
+        line around that occurrence is cut out of the text. Each entry keeps the
+        semantics of the original line-by-line search: the value saved is whatever
+        comes after the pattern in that line (see SeuMetaData in sections.py).
+
+        Logs can be matched as bytes, as read from the file, in which case only the
+        values found are decoded. A byte which is not valid UTF-8 elsewhere in the log
+        then does not stop the log from being parsed.
+
+        Build the matcher once and reuse it for all logs.
+
+        :param entries: Maps the name of each entry to its match pattern
+        :type entries: Dict[str, str]
+        """
+        self.entries = entries
+        self._byte_entries = {
+            info: pattern.encode(self.encoding) for info, pattern in entries.items()
+        }
+
+    @classmethod
+    def from_seu_metadata(
+        cls, run_info: RunInfo, info_to_find: List[str]
+    ) -> LogMatcher:
+        """
+        Creates the matcher used for SEU logs. Entries are looked up in the
+        SEU_METADATA section first, and in the COMPARISON_DATA section otherwise.
+
+        :param run_info: Configuration object
+        :type run_info: RunInfo
+        :param info_to_find: Names of the entries the matcher should find
+        :type info_to_find: List[str]
+        :return: Matcher for the SEU logs
+        :rtype: LogMatcher
+        """
+        entries = dict()
+        for info in info_to_find:
+            if hasattr(run_info.seu_metadata, info):
+                entries[info] = getattr(run_info.seu_metadata, info)
+            else:
+                entries[info] = getattr(run_info.comparison_data, info)
+
+        return cls(entries)
+
+    @classmethod
+    def from_comparison_data(cls, run_info: RunInfo) -> LogMatcher:
+        """
+        Creates the matcher used for the golden log, which only looks for the entries
+        in the COMPARISON_DATA section.
+
+        :param run_info: Configuration object
+        :type run_info: RunInfo
+        :return: Matcher for the golden log
+        :rtype: LogMatcher
+        """
+        return cls(
+            {
+                info: getattr(run_info.comparison_data, info)
+                for info in run_info.comparison_data.entries
+            }
+        )
+
+    def match(self, text: Union[str, bytes], infos: List[str] = None) -> Dict[str, str]:
+        """
+        Finds the value of every entry in the text of a log.
+
+        :param text: Full text of the log, either decoded or as bytes
+        :type text: Union[str, bytes]
+        :param infos: Names of the entries to look for. All entries are looked for if
+        None, defaults to None
+        :type infos: List[str], optional
+        :raises UnicodeDecodeError: Raised if the text is bytes, and a value found is
+        not valid UTF-8
+        :return: Maps the name of each found entry to its value. Entries which are not
+        found in the log are not present in the dictionary.
+        :rtype: Dict[str, str]
+        """
+        is_bytes = isinstance(text, bytes)
+        entries = self._byte_entries if is_bytes else self.entries
+        newline = b"\n" if is_bytes else "\n"
+        if infos is None:
+            infos = entries.keys()
+        found = dict()
+
+        for info in infos:
+            match_pattern = entries[info]
+            pos = text.find(match_pattern)
+            if pos == -1:
+                continue
+
+            line_start = text.rfind(newline, 0, pos) + 1
+            line_end = text.find(newline, pos + len(match_pattern))
+            if line_end == -1:
+                line_end = len(text)
+
+            line = text[line_start:line_end]
+            value = line.split(match_pattern)[1].strip()
+            found[info] = value.decode(self.encoding) if is_bytes else value
+
+        return found
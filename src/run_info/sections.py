@@ -11,6 +11,13 @@ class Data:
     max_ram_usage: int = None
     max_number_logs: int = None
     cpu_cycles : int = None
+    n_workers: int = None
+    cache: bool = None
+    sample_size: int = None
+    sample_seed: int = None
+    sample_strata_depth: int = None
+    read_head_kb: int = None
+    read_tail_kb: int = None
 
     def __init__(self, runinfo_path: str) -> None:
         """
@@ -20,7 +27,12 @@ class Data:
         and other settings regarding to parsin the data, such as timeout.
 
         All variables of this class are hard-coded, and as such must be present in
-        the config file.
+        the config file. The exceptions are n_workers, which defaults to 1 (serial
+        parsing), cache, which defaults to 0 (no cache), max_ram_usage (in MB) and
+        max_number_logs, which default to -1 (no limit), and sample_size,
+        sample_seed and sample_strata_depth, which default to -1 (all runs), 0, and
+        -1 (uniform sample), and read_head_kb and read_tail_kb, which default to -1
+        (read the full logs), if they are not present.
 
         :param runinfo_path: path to the runinfo file, these are the *.ini files in the
         same folder as ths file.
@@ -35,15 +47,88 @@ class Data:
         self.vpi = str(config["DATA"]["vpi"])
         self.timeout = int(config["DATA"]["timeout"])
         self.read_optional = bool(int(config["DATA"]["read_optional"]))
-        self.cpu_cyles = int(config["DATA"]["cpu_cycles"])
+        self.cpu_cycles = int(config["DATA"]["cpu_cycles"])
+        # misspelled name, kept for the notebooks which use it
+        self.cpu_cyles = self.cpu_cycles
         # vpi_bits added manually, since in some runs we didnt print vpi signal from the simulations
         self.vpi_bits = int(config["DATA"]["vpi_bits"]) 
+        self.n_workers = int(config["DATA"].get("n_workers", "1"))
+        self.cache = bool(int(config["DATA"].get("cache", "0")))
+        self.max_ram_usage = int(config["DATA"].get("max_ram_usage", "-1"))
+        self.max_number_logs = int(config["DATA"].get("max_number_logs", "-1"))
+        self.sample_size = int(config["DATA"].get("sample_size", "-1"))
+        self.sample_seed = int(config["DATA"].get("sample_seed", "0"))
+        self.sample_strata_depth = int(config["DATA"].get("sample_strata_depth", "-1"))
+        self.read_head_kb = int(config["DATA"].get("read_head_kb", "-1"))
+        self.read_tail_kb = int(config["DATA"].get("read_tail_kb", "-1"))
 
         if self.timeout != -1 and self.timeout < 0:
             raise ValueError(
                 "Timeout in config is negative, and -1. Check your ini file."
             )
 
+        if self.n_workers != -1 and self.n_workers < 1:
+            raise ValueError(
+                "n_workers in config is below 1, and not -1. Check your ini file."
+            )
+
+        if self.max_ram_usage != -1 and self.max_ram_usage < 1:
+            raise ValueError(
+                "max_ram_usage in config is below 1, and not -1. Check your ini file."
+            )
+
+        if self.max_number_logs != -1 and self.max_number_logs < 1:
+            raise ValueError(
+                "max_number_logs in config is below 1, and not -1. Check your ini file."
+            )
+
+        if self.sample_size != -1 and self.sample_size < 1:
+            raise ValueError(
+                "sample_size in config is below 1, and not -1. Check your ini file."
+            )
+
+        if self.sample_strata_depth != -1 and self.sample_strata_depth < 1:
+            raise ValueError(
+                "sample_strata_depth in config is below 1, and not -1. Check your ini "
+                "file."
+            )
+
+        if self.read_head_kb != -1 and self.read_head_kb < 0:
+            raise ValueError(
+                "read_head_kb in config is below 0, and not -1. Check your ini file."
+            )
+
+        if self.read_tail_kb != -1 and self.read_tail_kb < 0:
+            raise ValueError(
+                "read_tail_kb in config is below 0, and not -1. Check your ini file."
+            )
+
+    @property
+    def limits_parsing(self) -> bool:
+        """
+        Whether parsing can stop before all runs are read, because of the timeout,
+        max_ram_usage or max_number_logs entries.
+
+        :return: True if any of the limits is set
+        :rtype: bool
+        """
+        return (
+            self.timeout != -1
+            or self.max_ram_usage != -1
+            or self.max_number_logs != -1
+        )
+
+    @property
+    def reads_partially(self) -> bool:
+        """
+        Whether the SEU logs are read from their head and tail only, because of the
+        read_head_kb or read_tail_kb entries.
+
+        :return: True if either entry is set
+        :rtype: bool
+        """
+        return self.read_head_kb != -1 or self.read_tail_kb != -1
+
 
 class Debug:
     error_utf_parsing: bool = None
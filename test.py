@@ -1,7 +1,6 @@
 from src.data_interface import DataInterface
 from src.run_info.run_info import RunInfo
-from src.analysis.base_tools import BaseTools
-from src.analysis.structures.error_definitions import SilentError
+from src.analysis.interval_validation import IntervalValidation
 from src.colorprint import ColorPrinter as cp
 
 import pandas as pd
@@ -27,126 +26,66 @@ if __name__ == "__main__":
     run_info = RunInfo(run_info_path)
     data_interface = DataInterface(run_info)
 
-    def time_fixer(x: str):
-        x = int(x)
-        mod = x % 5
-        if mod == 0:
-            return (x + 20) / 10 - 1
-        else:
-            return (x + (5 - mod) + 20) / 10 - 1
-
-    nans = data_interface.seu_log["injection_cycle"].isna()
-    data_interface.seu_log["injection_cycle"] = data_interface.seu_log[
-        "injection_cycle"
-    ][~nans].apply(time_fixer)
+    data_interface.seu_log[
+        seu_injection_cycle_column
+    ] = IntervalValidation.simulation_time_to_cycle(
+        data_interface.seu_log[seu_injection_cycle_column]
+    )
 
     node = data_interface.get_node_by_name(register_file_name)[0]
     node_seu_logs = data_interface.get_seu_log_by_node(node)
     cp.print_bold(f"Number of SEU logs on register file: {len(node_seu_logs)}")
     print()
-    error_classification = BaseTools.error_classification(
-        data_interface, node, visualize=False
-    )
 
     inject_intervals = pd.read_csv(
         inject_intervals_path, index_col=inject_intervals_index_column
     ).astype(int)
 
-    checking_df = dict()
-    for run_name, row in node_seu_logs.iterrows():
-        register = "x" + str(
-            (number_of_registers - 1) - int(row["register"].split("[")[1].strip("]"))
-        )
-        injection_cycle = int(
-            float(row[seu_injection_cycle_column])
-        )  # TODO: rounding of half cycle happens here! does it need a change?
-        bit_number = int(row[bit_number_column])
-        seed = int(row[seed_column].split("\x1b")[0])
-        error_class = error_classification.loc[run_name]
-        is_silent = error_class == SilentError.name
-        try:
-            is_sensitive = inject_intervals[register][injection_cycle] != 0
-            encoded_cycle = inject_intervals[register][injection_cycle]
-        except KeyError:
-            cp.print_fail("===== WARNING =====")
-            cp.print_fail(f"Run {run_name} is not in encoded_intervals")
-            cp.print_fail(f"Register: {register}")
-            cp.print_fail(f"Cycle: {injection_cycle}")
-            cp.print_fail("")
-            continue
-
-        checking_df[run_name] = {
-            "register": register,
-            "injection_cycle": injection_cycle,
-            "bit_number": bit_number,
-            "seed": seed,
-            "error_class": error_class,
-            "is_silent": is_silent,
-            "is_sensitive": is_sensitive,
-            "encoded_cycle": encoded_cycle,
-        }
-    checking_df = pd.DataFrame(checking_df).T
+    # TODO: rounding of half cycle happens in injection_table! does it need a change?
+    checking_df, missing_df = IntervalValidation.injection_table(
+        data_interface,
+        node,
+        inject_intervals,
+        number_of_registers,
+        injection_cycle_column=seu_injection_cycle_column,
+        bit_number_column=bit_number_column,
+        seed_column=seed_column,
+    )
+
+    for run_name, row in missing_df.iterrows():
+        cp.print_fail("===== WARNING =====")
+        cp.print_fail(f"Run {run_name} is not in encoded_intervals")
+        cp.print_fail(f"Register: {row['register']}")
+        cp.print_fail(f"Cycle: {row['injection_cycle']}")
+        cp.print_fail("")
     # ==================================================================================
 
     # ==================================================================================
     # Test if all non_sensitive injections are silent
     # ==================================================================================
-    false_negative_check_df = checking_df.copy()
-    false_negative_check_df["is_false_negative"] = false_negative_check_df.apply(
-        lambda row: not row["is_silent"] and not row["is_sensitive"], axis=1
-    )
+    false_negatives = IntervalValidation.false_negatives(checking_df)
 
     cp.print_bold("Non-silent error in non-sensitive injections check:")
-    if false_negative_check_df["is_false_negative"].any():
+    if len(false_negatives) > 0:
         cp.print_fail("Test failed. Some non-sensitive injections are not silent.")
-        print(false_negative_check_df["is_false_negative"].value_counts())
+        print(IntervalValidation.confusion_matrix(checking_df))
     else:
         cp.print_ok("Test passed. All non-sensitive injections are silent.")
     print("")
 
     if save_false_negatives:
-        false_negative_check_df[false_negative_check_df["is_false_negative"]][
-            ["register", "injection_cycle", "seed"]
-        ].to_csv("test/false_negatives.csv")
-
-    f1 = checking_df.apply(
-        lambda row: not row["is_silent"] and not row["is_sensitive"], axis=1
-    )
-    f2 = checking_df.apply(
-        lambda row: not row["is_silent"] and row["is_sensitive"], axis=1
-    )
-    f3 = checking_df.apply(
-        lambda row: row["is_silent"] and not row["is_sensitive"], axis=1
-    )
-    f4 = checking_df.apply(lambda row: row["is_silent"] and row["is_sensitive"], axis=1)
+        false_negatives[["register", "injection_cycle", "seed"]].to_csv(
+            "test/false_negatives.csv"
+        )
     # ==================================================================================
 
     # ==================================================================================
     # Test if all equivalent injections are of the same error class
     # ==================================================================================
-    equivalent_injection_check_df = checking_df.copy()
-    equivalent_injection_check_df = equivalent_injection_check_df[
-        equivalent_injection_check_df["encoded_cycle"] != 0
-    ]
-
-    equivalent_injection_check_df["unique"] = equivalent_injection_check_df.apply(
-        lambda row: "Register: "
-        + str(row["register"])
-        + "\nEncoded cycle: "
-        + str(row["encoded_cycle"])
-        + "\nBit number: "
-        + str(row["bit_number"]),
-        axis=1,
-    )
-
-    i = 0
-    for unique_val, unique in equivalent_injection_check_df.groupby("unique"):
-        if unique["error_class"].nunique() == 1:
-            continue
+    inconsistent = IntervalValidation.inconsistent_injections(checking_df)
 
-        i += 1
-
-        if save_injection_interval_assumption:
+    if save_injection_interval_assumption:
+        for i, unique in inconsistent.groupby("equivalence_class"):
             unique[
                 [
                     "register",
@@ -156,10 +95,10 @@ if __name__ == "__main__":
                     "seed",
                     "error_class",
                 ]
-            ].to_csv(f"test/injection_interval_assumption_{i}.csv")
+            ].to_csv(f"test/injection_interval_assumption_{i + 1}.csv")
 
     cp.print_bold("Equivalent injection check:")
-    if i == 0:
+    if len(inconsistent) == 0:
         cp.print_ok(
             "Test passed. All equivalent injections are of the same error class."
         )
@@ -167,5 +106,3 @@ if __name__ == "__main__":
         cp.print_fail(
             "Test failed. Some equivalent injections are not of the same error class."
         )
-
-    _ = ""